@@ -1,12 +1,16 @@
+from typing import Generator
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from starlette.requests import Request
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.middleware import LAST_WRITE_COOKIE, LAST_WRITE_HEADER
+from app.db.session import get_async_db, get_db, open_replica_session, parse_last_write
 from app.core.security import decode_token
 from app.models.user import User, UserRole
+from app.services import principal_cache, token_epoch_service
 from app.services.auth_service import get_user_by_email
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -17,11 +21,21 @@ def get_current_user(request: Request, token: str = Depends(oauth2_scheme), db:
     email: str | None = payload.get("sub")  # type: ignore
     if email is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-    user = get_user_by_email(db, email)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    if token_epoch_service.is_stateless(payload):
+        epoch = token_epoch_service.get_epoch(db, payload["uid"])
+        user = db.merge(token_epoch_service.principal_from_claims(payload, epoch), load=False)
+    elif (cached := principal_cache.lookup(email)) is not None:
+        user = db.merge(cached, load=False)  # attach without a round trip
+    else:
+        user = get_user_by_email(db, email)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal_cache.remember(user)
     # Store user_id for logging middleware
     request.state.user_id = user.id  # type: ignore[attr-defined]
+    # Lets the session record this user's commits for replica read-your-writes
+    db.info["user_id"] = user.id
+    db.info["request_state"] = request.state
     return user
 
 
@@ -29,3 +43,53 @@ def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != UserRole.admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
     return current_user
+
+
+def get_read_db(
+    request: Request, primary: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+) -> Generator:
+    """Session for read-only endpoints: a replica when configured, else the primary session.
+
+    Falls back to the primary while the caller is inside their read-your-writes window,
+    as known to this process or carried by the request (X-Last-Write header or cookie).
+    """
+    carried = (parse_last_write(request.headers.get(LAST_WRITE_HEADER)), parse_last_write(request.cookies.get(LAST_WRITE_COOKIE)))
+    last_write_at = max((t for t in carried if t is not None), default=None)
+    replica = open_replica_session(current_user.id, last_write_at)
+    if replica is None:
+        yield primary
+        return
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+
+# --- Async stack (DB_STACK=async) -------------------------------------------
+
+async def get_current_user_async(request: Request, token: str = Depends(oauth2_scheme), db=Depends(get_async_db)) -> User:
+    # Imported lazily: the async stack needs greenlet, which sync deployments may lack
+    from app.services.async_auth_service import get_user_by_email as get_user_by_email_async
+
+    payload = decode_token(token)
+    email: str | None = payload.get("sub")  # type: ignore
+    if email is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    if token_epoch_service.is_stateless(payload):
+        epoch = await token_epoch_service.get_epoch_async(db, payload["uid"])
+        user = await db.merge(token_epoch_service.principal_from_claims(payload, epoch), load=False)
+    elif (cached := principal_cache.lookup(email)) is not None:
+        user = await db.merge(cached, load=False)
+    else:
+        user = await get_user_by_email_async(db, email)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        principal_cache.remember(user)
+    request.state.user_id = user.id  # type: ignore[attr-defined]
+    return user
+
+
+async def get_current_admin_async(current_user: User = Depends(get_current_user_async)) -> User:
+    if current_user.role != UserRole.admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return current_user
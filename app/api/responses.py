@@ -0,0 +1,89 @@
+"""Single-pass JSON responses for task endpoints.
+
+Returning a pydantic model from a route costs two rounds of work: the route
+validates ORM rows into ``TaskRead`` objects, then FastAPI validates the return
+value against ``response_model`` again and encodes the result with ``json``.
+The helpers here hand ORM objects (or Core rows) to a pydantic ``TypeAdapter``
+that validates from attributes and emits JSON bytes in one call, and wrap the
+bytes in a response FastAPI sends as-is. Routes keep their ``response_model``,
+so the OpenAPI schema and the response shape are unchanged.
+
+Task GETs also carry strong ETags (``make_etag``); a matching ``If-None-Match``
+is answered with ``not_modified`` before any row is loaded or serialized.
+Listings only look up their version when it pays off (a conditional request,
+or the response cache); otherwise the ETag is a hash of the body (``body_etag``).
+"""
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, status
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from app.schemas.task import PaginatedTasks, TaskRead
+
+_task_adapter = TypeAdapter(TaskRead)
+_page_adapter = TypeAdapter(PaginatedTasks)
+
+
+class RawJSONResponse(Response):
+    """A response whose body is already encoded JSON."""
+    media_type = "application/json"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the version parts of a representation (ids, timestamps, counts, query)."""
+    return '"%s"' % hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag over the encoded representation itself."""
+    return '"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+def task_etag(task: Any) -> str:
+    """ETag of a single task; ``task`` is a ``Task`` or a ``get_task_version`` row."""
+    return make_etag("task", task.id, task.updated_at)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison (RFC 9110 13.1.2)
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _cache_headers(etag: Optional[str]) -> Optional[Dict[str, str]]:
+    # Responses are per user: clients and private caches keep them, but revalidate every time
+    return {"ETag": etag, "Cache-Control": "private, no-cache"} if etag else None
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+
+
+def dump_task(task: Any) -> bytes:
+    return _task_adapter.dump_json(_task_adapter.validate_python(task, from_attributes=True))
+
+
+def dump_task_page(page: Any) -> bytes:
+    """``page`` is a ``task_service.TaskPage`` (or anything with the same attributes)."""
+    return _page_adapter.dump_json(_page_adapter.validate_python(page, from_attributes=True))
+
+
+def json_response(body: bytes, status_code: int = status.HTTP_200_OK, etag: Optional[str] = None) -> RawJSONResponse:
+    return RawJSONResponse(body, status_code=status_code, headers=_cache_headers(etag))
+
+
+def task_response(task: Any, status_code: int = status.HTTP_200_OK, etag: Optional[str] = None) -> RawJSONResponse:
+    return json_response(dump_task(task), status_code=status_code, etag=etag)
+
+
+def cached_response(request: Request, entry: Tuple[Optional[str], bytes]) -> Response:
+    """Serve an ``(etag, body)`` entry of the task response cache, honouring If-None-Match."""
+    etag, body = entry
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    return json_response(body, etag=etag)
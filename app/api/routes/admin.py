@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies import get_current_admin
+from app.core.config import settings
+from app.core.logging import logging_stats
+from app.core.password_pool import hash_pool
+from app.core.security import verified_tokens
+from app.db import pool_metrics
+from app.models.user import User
+from app.services import principal_cache, task_cache, task_service, token_epoch_service
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/diagnostics/db-pool")
+def db_pool_diagnostics(admin: User = Depends(get_current_admin)):
+    """Live pool gauges and checkout wait/timeout counters for this worker process."""
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        },
+        "engines": {name: metrics.snapshot() for name, metrics in pool_metrics.registry.items()},
+    }
+
+@router.get("/diagnostics/caches")
+def cache_diagnostics(admin: User = Depends(get_current_admin)):
+    """Size and hit/miss counters of this worker's in-process caches."""
+    return {
+        "verified_tokens": verified_tokens.stats(),
+        "principals": principal_cache.principals.stats(),
+        "token_epochs": token_epoch_service.epochs.stats(),
+        "task_counts": task_cache.counts.stats(),
+        "task_responses": task_cache.responses.stats(),
+    }
+
+@router.get("/diagnostics/coalescing")
+def coalescing_diagnostics(admin: User = Depends(get_current_admin)):
+    """How many task listing reads ran against the database vs. joined an identical in-flight one."""
+    # Imported here so the sync app does not load the async stack just for its counters
+    from app.services import async_task_service
+
+    return {
+        "enabled": settings.TASK_READ_COALESCING,
+        "threadpool": task_service.list_flights.stats(),
+        "asyncio": async_task_service.list_flights.stats(),
+    }
+
+@router.get("/diagnostics/password-hashing")
+def password_hashing_diagnostics(admin: User = Depends(get_current_admin)):
+    """Queue depth, rejections and queue/hash timings of the bcrypt worker pool."""
+    return hash_pool.stats()
+
+@router.get("/diagnostics/logging")
+def logging_diagnostics(admin: User = Depends(get_current_admin)):
+    """Log pipeline queue depth, dropped-record count and writer throughput."""
+    return logging_stats()
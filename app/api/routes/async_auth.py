@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, status, Request
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.db.session import get_async_db
+from app.schemas.user import UserCreate, UserRead
+from app.schemas.auth import Token
+from app.services.async_auth_service import create_user, authenticate_user
+from app.services.token_epoch_service import issue_access_token_async
+from app.core.logging import log_business_step
+
+# Async twin of app/api/routes/auth.py, mounted ahead of it when DB_STACK=async.
+router = APIRouter(prefix="/auth", tags=["auth"], include_in_schema=False)
+
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def register(user_in: UserCreate, request: Request, db=Depends(get_async_db)):
+    log_business_step(
+        "user_registration_start",
+        {"email": user_in.email},
+        request=request
+    )
+    try:
+        user = await create_user(db, user_in)
+    except Exception as e:
+        log_business_step(
+            "user_registration_failed",
+            {"email": user_in.email, "error": str(e), "error_type": type(e).__name__},
+            request=request,
+            level="error"
+        )
+        raise
+    log_business_step(
+        "user_created_successfully",
+        {"user_id": user.id, "email": user.email, "role": user.role.value},
+        request=request,
+        user_id=user.id
+    )
+    return UserRead.model_validate(user)
+
+@router.post("/login", response_model=Token)
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db=Depends(get_async_db)):
+    log_business_step(
+        "user_login_start",
+        {"email": form_data.username},
+        request=request
+    )
+    try:
+        user = await authenticate_user(db, form_data.username, form_data.password)
+    except Exception as e:
+        log_business_step(
+            "user_login_failed",
+            {"email": form_data.username, "error": str(e), "error_type": type(e).__name__},
+            request=request,
+            level="error"
+        )
+        raise
+    token = await issue_access_token_async(db, user)
+    log_business_step(
+        "user_login_completed",
+        {"user_id": user.id, "email": user.email, "token_length": len(token)},
+        request=request,
+        user_id=user.id
+    )
+    return Token(access_token=token)
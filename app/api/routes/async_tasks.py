@@ -0,0 +1,215 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from typing import Optional
+from datetime import date
+
+from app.api.dependencies import get_current_user_async
+from app.api.responses import body_etag, cached_response, dump_task_page, etag_matches, json_response, make_etag, not_modified, task_etag, task_response
+from app.db.session import get_async_db
+from app.models.user import User
+from app.schemas.task import TaskCreate, TaskRead, TaskUpdate, PaginatedTasks
+from app.services import async_task_service, task_cache
+from app.core.logging import log_business_step
+
+# Async twin of the CRUD/list endpoints in app/api/routes/tasks.py, mounted ahead
+# of it when DB_STACK=async. Task ids use the ``int`` convertor so paths such as
+# /tasks/export and /tasks/bulk fall through to the sync router.
+router = APIRouter(prefix="/tasks", tags=["tasks"], include_in_schema=False)
+
+@router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
+async def create_task(task_in: TaskCreate, request: Request, db=Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    log_business_step(
+        "task_creation_start",
+        {"title": task_in.title, "has_description": bool(task_in.description), "has_due_date": bool(task_in.due_date)},
+        request=request,
+        user_id=current_user.id
+    )
+    try:
+        task = await async_task_service.create_task(db, current_user, task_in)
+    except Exception as e:
+        log_business_step(
+            "task_creation_failed",
+            {"title": task_in.title, "error": str(e), "error_type": type(e).__name__},
+            request=request,
+            user_id=current_user.id,
+            level="error"
+        )
+        raise
+    log_business_step(
+        "task_created_successfully",
+        {"task_id": task.id, "status": task.status.value, "owner_id": task.owner_id},
+        request=request,
+        user_id=current_user.id
+    )
+    return task_response(task, status_code=status.HTTP_201_CREATED)
+
+@router.get("/", response_model=PaginatedTasks)
+async def list_tasks(
+    request: Request,
+    db=Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    due_before: Optional[date] = None,
+    due_after: Optional[date] = None,
+    all: bool = False,
+    order: str = Query("created", pattern="^(created|relevance)$"),
+    include_total: bool = True,
+):
+    log_business_step(
+        "task_list_request_start",
+        {
+            "limit": limit,
+            "offset": offset,
+            "cursor_mode": bool(cursor),
+            "search_query": q,
+            "order": order,
+            "status_filter": status,
+            "admin_view": all,
+        },
+        request=request,
+        user_id=current_user.id
+    )
+    all_tasks = all and current_user.role == current_user.role.admin
+    try:
+        # The version costs an aggregate over the matching rows; it is only worth it when it
+        # can answer a conditional request without loading the page, or key the response cache
+        version = None
+        if request.headers.get("if-none-match") or task_cache.responses.enabled:
+            version = await async_task_service.list_version(
+                db,
+                owner=current_user,
+                all_tasks=all_tasks,
+                q=q,
+                status=status,
+                due_before=due_before,
+                due_after=due_after,
+            )
+        listing = task_cache.listing_key(
+            None if all_tasks else current_user.id,
+            current_user.role.value,
+            (q, status, due_before, due_after),
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            order=order,
+            include_total=include_total,
+        )
+        # Only versioned listings are cached: the version is read from the database, so the key
+        # moves with writes from any worker. The ETag comes from the same key, so a hit serves it as is
+        cache_key = version and (*listing, version)
+        etag = make_etag("tasks", *cache_key) if cache_key else None
+        if etag and etag_matches(request, etag):
+            log_business_step("task_list_not_modified", {"total_tasks": version[1]}, request=request, user_id=current_user.id)
+            return not_modified(etag)
+        cached = task_cache.responses.get(cache_key) if cache_key else None
+        if cached is not None:
+            log_business_step("task_list_cache_hit", {"limit": limit, "offset": offset}, request=request, user_id=current_user.id)
+            return cached_response(request, cached)
+        page = await async_task_service.list_tasks(
+            db,
+            owner=current_user,
+            all_tasks=all_tasks,
+            q=q,
+            status=status,
+            due_before=due_before,
+            due_after=due_after,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            order_by_relevance=order == "relevance",
+            include_total=include_total,
+            known_total=version[1] if version else None,
+        )
+    except Exception as e:
+        log_business_step(
+            "task_list_failed",
+            {"error": str(e), "error_type": type(e).__name__},
+            request=request,
+            user_id=current_user.id,
+            level="error"
+        )
+        raise
+    log_business_step(
+        "task_list_completed",
+        {"total_tasks": page.total, "returned_tasks": len(page.items), "has_more": page.next_cursor is not None},
+        request=request,
+        user_id=current_user.id
+    )
+    body = dump_task_page(page)
+    if cache_key:
+        task_cache.responses.set(cache_key, (etag, body))
+    # Responses served without a version carry a hash of the body; those ETags still validate
+    representation = body_etag(body)
+    if etag_matches(request, representation):
+        log_business_step("task_list_not_modified", {"total_tasks": page.total}, request=request, user_id=current_user.id)
+        return not_modified(etag or representation)
+    return json_response(body, etag=etag or representation)
+
+async def _get_task_or_404(db, task_id: int, request: Request, current_user: User, lookup=async_task_service.get_task_by_id):
+    task = await lookup(db, task_id)
+    if not task:
+        log_business_step(
+            "task_not_found",
+            {"task_id": task_id},
+            request=request,
+            user_id=current_user.id,
+            level="warning"
+        )
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    return task
+
+@router.get("/{task_id:int}", response_model=TaskRead)
+async def get_task(task_id: int, request: Request, db=Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    # A conditional poll only needs (owner_id, updated_at) until the client's copy proves stale
+    conditional = "if-none-match" in request.headers
+    lookup = async_task_service.get_task_version if conditional else async_task_service.get_task_by_id
+    task = await _get_task_or_404(db, task_id, request, current_user, lookup)
+    if current_user.role != current_user.role.admin and task.owner_id != current_user.id:
+        log_business_step(
+            "task_access_denied",
+            {"task_id": task_id, "task_owner_id": task.owner_id, "reason": "not_owner_or_admin"},
+            request=request,
+            user_id=current_user.id,
+            level="warning"
+        )
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    if conditional:
+        etag = task_etag(task)
+        if etag_matches(request, etag):
+            log_business_step("task_not_modified", {"task_id": task_id}, request=request, user_id=current_user.id)
+            return not_modified(etag)
+        task = await _get_task_or_404(db, task_id, request, current_user)
+    log_business_step(
+        "task_retrieved_successfully",
+        {"task_id": task.id, "owner_id": task.owner_id},
+        request=request,
+        user_id=current_user.id
+    )
+    return task_response(task, etag=task_etag(task))
+
+@router.put("/{task_id:int}", response_model=TaskRead)
+async def update_task(task_id: int, task_in: TaskUpdate, request: Request, db=Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    task = await _get_task_or_404(db, task_id, request, current_user)
+    updated_task = await async_task_service.update_task(db, task=task, task_in=task_in, current_user=current_user)
+    log_business_step(
+        "task_updated_successfully",
+        {"task_id": updated_task.id, "updated_by": current_user.id},
+        request=request,
+        user_id=current_user.id
+    )
+    return task_response(updated_task)
+
+@router.delete("/{task_id:int}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task(task_id: int, request: Request, db=Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    task = await _get_task_or_404(db, task_id, request, current_user)
+    await async_task_service.delete_task(db, task=task, current_user=current_user)
+    log_business_step(
+        "task_deleted_successfully",
+        {"task_id": task_id, "deleted_by": current_user.id},
+        request=request,
+        user_id=current_user.id
+    )
+    return None
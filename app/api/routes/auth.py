@@ -6,7 +6,7 @@ from app.db.session import get_db
 from app.schemas.user import UserCreate, UserRead
 from app.schemas.auth import Token
 from app.services.auth_service import create_user, authenticate_user
-from app.core.security import create_access_token
+from app.services.token_epoch_service import issue_access_token
 from app.core.logging import log_business_step
 from app.models.user import User
 
@@ -90,7 +90,7 @@ def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db
             user_id=user.id
         )
         
-        token = create_access_token({"sub": user.email})
+        token = issue_access_token(db, user)
         
         log_business_step(
             "user_login_completed",
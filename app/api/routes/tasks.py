@@ -1,15 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterator, Optional
 from datetime import date
+import csv
+import io
 
-from app.api.dependencies import get_current_user, get_current_admin
+from app.api.dependencies import get_current_user, get_current_admin, get_read_db
+from app.api.responses import body_etag, cached_response, dump_task_page, etag_matches, json_response, make_etag, not_modified, task_etag, task_response
 from app.db.session import get_db
 from app.models.user import User
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskRead, TaskUpdate, PaginatedTasks
-from app.services import task_service
+from app.schemas.task import (
+    TaskCreate,
+    TaskRead,
+    TaskUpdate,
+    PaginatedTasks,
+    TaskBulkCreate,
+    TaskBulkUpdate,
+    TaskBulkDelete,
+    TaskBulkResult,
+    TaskImportResult,
+    TaskStatsRead,
+)
+from app.services import task_cache, task_service, task_stats_service, import_service
 from app.core.logging import log_business_step
+from app.core.config import settings
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -53,7 +69,7 @@ def create_task(task_in: TaskCreate, request: Request, db: Session = Depends(get
             user_id=current_user.id
         )
         
-        return TaskRead.model_validate(task)
+        return task_response(task, status_code=status.HTTP_201_CREATED)
         
     except Exception as e:
         log_business_step(
@@ -72,22 +88,28 @@ def create_task(task_in: TaskCreate, request: Request, db: Session = Depends(get
 @router.get("/", response_model=PaginatedTasks)
 def list_tasks(
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
     q: Optional[str] = None,
     status: Optional[str] = None,
     due_before: Optional[date] = None,
     due_after: Optional[date] = None,
     all: bool = False,
+    order: str = Query("created", pattern="^(created|relevance)$"),
+    include_total: bool = True,
 ):
     log_business_step(
         "task_list_request_start",
         {
             "limit": limit,
             "offset": offset,
+            "cursor_mode": bool(cursor),
             "search_query": q,
+            "order": order,
+            "include_total": include_total,
             "status_filter": status,
             "due_before": str(due_before) if due_before else None,
             "due_after": str(due_after) if due_after else None,
@@ -113,34 +135,85 @@ def list_tasks(
             user_id=current_user.id
         )
         
-        total, tasks = task_service.list_tasks(
+        all_tasks = all and current_user.role == current_user.role.admin
+        # The version costs an aggregate over the matching rows; it is only worth it when it can
+        # answer a conditional request without loading the page, or key the response cache. It is
+        # read before the page, so a concurrent write can only make the ETag older than the body
+        version = None
+        if request.headers.get("if-none-match") or task_cache.responses.enabled:
+            version = task_service.list_version(
+                db,
+                owner=current_user,
+                all_tasks=all_tasks,
+                q=q,
+                status=status,
+                due_before=due_before,
+                due_after=due_after,
+            )
+        listing = task_cache.listing_key(
+            None if all_tasks else current_user.id,
+            current_user.role.value,
+            (q, status, due_before, due_after),
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            order=order,
+            include_total=include_total,
+        )
+        # Only versioned listings are cached: the version is read from the database, so the key
+        # moves with writes from any worker. The ETag comes from the same key, so a hit serves it as is
+        cache_key = version and (*listing, version)
+        etag = make_etag("tasks", *cache_key) if cache_key else None
+        if etag and etag_matches(request, etag):
+            log_business_step("task_list_not_modified", {"total_tasks": version[1]}, request=request, user_id=current_user.id)
+            return not_modified(etag)
+        cached = task_cache.responses.get(cache_key) if cache_key else None
+        if cached is not None:
+            log_business_step("task_list_cache_hit", {"limit": limit, "offset": offset}, request=request, user_id=current_user.id)
+            return cached_response(request, cached)
+
+        page = task_service.list_tasks(
             db,
             owner=current_user,
-            all_tasks=all and current_user.role == current_user.role.admin,
+            all_tasks=all_tasks,
             q=q,
             status=status,
             due_before=due_before,
             due_after=due_after,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            order_by_relevance=order == "relevance",
+            include_total=include_total,
+            known_total=version[1] if version else None,
         )
+        total, tasks = page.total, page.items
         
         log_business_step(
             "task_list_completed",
             {
                 "total_tasks": total,
                 "returned_tasks": len(tasks),
-                "has_more": total > (offset + len(tasks)),
+                "total_is_estimate": page.total_is_estimate,
+                "has_more": page.next_cursor is not None,
                 "page_info": {
                     "current_page": (offset // limit) + 1,
-                    "total_pages": (total + limit - 1) // limit
+                    "total_pages": (total + limit - 1) // limit if total is not None else None
                 }
             },
             request=request,
             user_id=current_user.id
         )
         
-        return PaginatedTasks(total=total, items=[TaskRead.model_validate(t) for t in tasks])
+        body = dump_task_page(page)
+        if cache_key:
+            task_cache.responses.set(cache_key, (etag, body))
+        # Responses served without a version carry a hash of the body; those ETags still validate
+        representation = body_etag(body)
+        if etag_matches(request, representation):
+            log_business_step("task_list_not_modified", {"total_tasks": page.total}, request=request, user_id=current_user.id)
+            return not_modified(etag or representation)
+        return json_response(body, etag=etag or representation)
         
     except Exception as e:
         log_business_step(
@@ -161,8 +234,233 @@ def list_tasks(
         )
         raise
 
+def _bulk_result(results) -> TaskBulkResult:
+    failed = sum(1 for r in results if r.status not in ("created", "updated", "deleted"))
+    return TaskBulkResult(succeeded=len(results) - failed, failed=failed, results=results)
+
+@router.post("/bulk", response_model=TaskBulkResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_tasks(payload: TaskBulkCreate, request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    log_business_step(
+        "task_bulk_create_start",
+        {"item_count": len(payload.items)},
+        request=request,
+        user_id=current_user.id
+    )
+    try:
+        result = _bulk_result(task_service.bulk_create_tasks(db, current_user, payload.items))
+    except Exception as e:
+        log_business_step(
+            "task_bulk_create_failed",
+            {"item_count": len(payload.items), "error": str(e), "error_type": type(e).__name__},
+            request=request,
+            user_id=current_user.id,
+            level="error"
+        )
+        raise
+    log_business_step(
+        "task_bulk_create_completed",
+        {"succeeded": result.succeeded, "failed": result.failed},
+        request=request,
+        user_id=current_user.id
+    )
+    return result
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+def bulk_update_tasks(payload: TaskBulkUpdate, request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    log_business_step(
+        "task_bulk_update_start",
+        {"item_count": len(payload.items)},
+        request=request,
+        user_id=current_user.id
+    )
+    try:
+        result = _bulk_result(task_service.bulk_update_tasks(db, items=payload.items, current_user=current_user))
+    except Exception as e:
+        log_business_step(
+            "task_bulk_update_failed",
+            {"item_count": len(payload.items), "error": str(e), "error_type": type(e).__name__},
+            request=request,
+            user_id=current_user.id,
+            level="error"
+        )
+        raise
+    log_business_step(
+        "task_bulk_update_completed",
+        {"succeeded": result.succeeded, "failed": result.failed},
+        request=request,
+        user_id=current_user.id
+    )
+    return result
+
+@router.delete("/bulk", response_model=TaskBulkResult)
+def bulk_delete_tasks(payload: TaskBulkDelete, request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    log_business_step(
+        "task_bulk_delete_start",
+        {"item_count": len(payload.ids)},
+        request=request,
+        user_id=current_user.id
+    )
+    try:
+        result = _bulk_result(task_service.bulk_delete_tasks(db, ids=payload.ids, current_user=current_user))
+    except Exception as e:
+        log_business_step(
+            "task_bulk_delete_failed",
+            {"item_count": len(payload.ids), "error": str(e), "error_type": type(e).__name__},
+            request=request,
+            user_id=current_user.id,
+            level="error"
+        )
+        raise
+    log_business_step(
+        "task_bulk_delete_completed",
+        {"succeeded": result.succeeded, "failed": result.failed},
+        request=request,
+        user_id=current_user.id
+    )
+    return result
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _export_chunks(batches, fmt: str, request: Request, user_id: int) -> Iterator[str]:
+    exported = 0
+    if fmt == "csv":
+        yield ",".join(task_service.EXPORT_COLUMNS) + "\r\n"
+    for batch in batches:
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for task in batch:
+                row = task.model_dump(mode="json")
+                writer.writerow(["" if row[c] is None else row[c] for c in task_service.EXPORT_COLUMNS])
+            yield buf.getvalue()
+        else:
+            yield "".join(task.model_dump_json() + "\n" for task in batch)
+        exported += len(batch)
+    log_business_step(
+        "task_export_completed",
+        {"format": fmt, "exported_tasks": exported},
+        request=request,
+        user_id=user_id
+    )
+
+@router.get("/export", response_class=StreamingResponse)
+def export_tasks(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    due_before: Optional[date] = None,
+    due_after: Optional[date] = None,
+    all: bool = False,
+):
+    """Stream every matching task as NDJSON or CSV (same filters/ownership as GET /tasks/)."""
+    log_business_step(
+        "task_export_start",
+        {
+            "format": format,
+            "search_query": q,
+            "status_filter": status,
+            "due_before": str(due_before) if due_before else None,
+            "due_after": str(due_after) if due_after else None,
+            "admin_view": all,
+        },
+        request=request,
+        user_id=current_user.id
+    )
+    batches = task_service.iter_tasks(
+        db,
+        owner=current_user,
+        all_tasks=all and current_user.role == current_user.role.admin,
+        q=q,
+        status=status,
+        due_before=due_before,
+        due_after=due_after,
+        batch_size=settings.TASK_EXPORT_BATCH_SIZE,
+    )
+    # The batches read from ``db`` while the body streams; FastAPI >= 0.118 keeps yield
+    # dependencies open until the response has been sent
+    return StreamingResponse(
+        _export_chunks(batches, format, request, current_user.id),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+@router.post("/import", response_model=TaskImportResult)
+def import_tasks(
+    request: Request,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Bulk-load tasks for the current user from a CSV or NDJSON upload."""
+    fmt = format or import_service.detect_format(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Cannot infer format; pass ?format=csv or ?format=ndjson")
+    log_business_step(
+        "task_import_start",
+        {"format": fmt, "upload_name": file.filename},
+        request=request,
+        user_id=current_user.id
+    )
+
+    def progress(result: TaskImportResult):
+        log_business_step(
+            "task_import_progress",
+            {"rows_read": result.rows_read, "imported": result.imported, "failed": result.failed},
+            request=request,
+            user_id=current_user.id
+        )
+
+    try:
+        result = import_service.import_tasks(
+            db,
+            current_user.id,
+            file.file,
+            fmt,
+            chunk_size=settings.TASK_IMPORT_CHUNK_SIZE,
+            max_errors=settings.TASK_IMPORT_MAX_ERRORS,
+            on_progress=progress,
+        )
+    except Exception as e:
+        log_business_step(
+            "task_import_failed",
+            {"format": fmt, "error": str(e), "error_type": type(e).__name__},
+            request=request,
+            user_id=current_user.id,
+            level="error"
+        )
+        raise
+    log_business_step(
+        "task_import_completed",
+        {"rows_read": result.rows_read, "imported": result.imported, "failed": result.failed},
+        request=request,
+        user_id=current_user.id
+    )
+    return result
+
+@router.get("/stats", response_model=TaskStatsRead)
+def task_stats(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    all: bool = False,
+):
+    """Task counts by status plus overdue; admins can pass ``all=true`` for every user's tasks."""
+    all_tasks = all and current_user.role == current_user.role.admin
+    stats = task_stats_service.get_stats(db, None if all_tasks else current_user.id)
+    log_business_step(
+        "task_stats_retrieved",
+        {"admin_view": all_tasks, "total_tasks": stats.total, "overdue": stats.overdue},
+        request=request,
+        user_id=current_user.id
+    )
+    return stats
+
 @router.get("/{task_id}", response_model=TaskRead)
-def get_task(task_id: int, request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_task(task_id: int, request: Request, db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     log_business_step(
         "task_get_request_start",
         {"task_id": task_id},
@@ -178,7 +476,9 @@ def get_task(task_id: int, request: Request, db: Session = Depends(get_db), curr
             user_id=current_user.id
         )
         
-        task = task_service.get_task_by_id(db, task_id)
+        # A conditional poll only needs (owner_id, updated_at) until the client's copy proves stale
+        conditional = "if-none-match" in request.headers
+        task = (task_service.get_task_version if conditional else task_service.get_task_by_id)(db, task_id)
         if not task:
             log_business_step(
                 "task_not_found",
@@ -218,6 +518,15 @@ def get_task(task_id: int, request: Request, db: Session = Depends(get_db), curr
             )
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
         
+        if conditional:
+            etag = task_etag(task)
+            if etag_matches(request, etag):
+                log_business_step("task_not_modified", {"task_id": task_id}, request=request, user_id=current_user.id)
+                return not_modified(etag)
+            task = task_service.get_task_by_id(db, task_id)
+            if not task:  # deleted since the version lookup
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+        
         log_business_step(
             "task_retrieved_successfully",
             {
@@ -231,7 +540,7 @@ def get_task(task_id: int, request: Request, db: Session = Depends(get_db), curr
             user_id=current_user.id
         )
         
-        return TaskRead.model_validate(task)
+        return task_response(task, etag=task_etag(task))
         
     except HTTPException:
         # Re-raise HTTP exceptions (already logged above)
@@ -254,7 +563,7 @@ def get_task(task_id: int, request: Request, db: Session = Depends(get_db), curr
 def update_task(task_id: int, task_in: TaskUpdate, request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     log_business_step(
         "task_update_request_start",
-        {
+        lambda: {
             "task_id": task_id,
             "updates": {
                 "title": task_in.title,
@@ -320,7 +629,7 @@ def update_task(task_id: int, task_in: TaskUpdate, request: Request, db: Session
             user_id=current_user.id
         )
         
-        return TaskRead.model_validate(updated_task)
+        return task_response(updated_task)
         
     except HTTPException:
         # Re-raise HTTP exceptions (already logged above)
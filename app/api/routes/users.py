@@ -2,21 +2,22 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.api.dependencies import get_current_admin
+from app.api.dependencies import get_current_admin, get_read_db
 from app.db.session import get_db
 from app.models.user import User, UserRole
 from app.schemas.user import UserRead, UserUpdateAdmin
-from app.core.security import get_password_hash
+from app.core.password_pool import hash_password
+from app.services import principal_cache, task_cache, task_stats_service, token_epoch_service
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=List[UserRead])
-def list_users(db: Session = Depends(get_db), admin: User = Depends(get_current_admin)):
+def list_users(db: Session = Depends(get_read_db), admin: User = Depends(get_current_admin)):
     users = db.query(User).order_by(User.created_at.desc()).all()
     return [UserRead.model_validate(u) for u in users]
 
 @router.get("/{user_id}", response_model=UserRead)
-def get_user(user_id: int, db: Session = Depends(get_db), admin: User = Depends(get_current_admin)):
+def get_user(user_id: int, db: Session = Depends(get_read_db), admin: User = Depends(get_current_admin)):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -27,6 +28,7 @@ def update_user(user_id: int, payload: UserUpdateAdmin, db: Session = Depends(ge
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    previous_email, previous_role = user.email, user.role
     if payload.email:
         # ensure uniqueness
         exists = db.query(User).filter(User.email == payload.email, User.id != user_id).first()
@@ -34,14 +36,20 @@ def update_user(user_id: int, payload: UserUpdateAdmin, db: Session = Depends(ge
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already in use")
         user.email = payload.email
     if payload.password:
-        user.hashed_password = get_password_hash(payload.password)
+        user.hashed_password = hash_password(payload.password)
     if payload.role:
         if payload.role not in {UserRole.user.value, UserRole.admin.value}:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid role")
         user.role = UserRole(payload.role)
+    revoke_tokens = bool(payload.password) or user.email != previous_email or user.role != previous_role
+    if revoke_tokens:
+        token_epoch_service.bump_epoch(db, user.id)
     db.add(user)
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(previous_email, user.email)
+    if revoke_tokens:
+        token_epoch_service.forget(user.id)
     return UserRead.model_validate(user)
 
 @router.delete("/{user_id}", status_code=204)
@@ -49,6 +57,12 @@ def delete_user(user_id: int, db: Session = Depends(get_db), admin: User = Depen
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    email = user.email
+    token_epoch_service.bump_epoch(db, user_id)
+    task_stats_service.forget_owner(db, user_id)
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(email)
+    token_epoch_service.forget(user_id)
+    task_cache.invalidate_owners([user_id])  # their tasks went with them (ON DELETE CASCADE)
     return None
@@ -0,0 +1,151 @@
+"""Non-blocking log pipeline: request threads enqueue, one background thread writes.
+
+``BoundedQueueHandler`` puts records on a bounded in-memory queue. What happens
+when the queue is full depends on the policy: ``drop`` discards the new record
+immediately, and ``block`` waits up to a timeout (backpressure on the request)
+before discarding it. Discarded records are counted. ``BatchingLogWriter``
+drains the queue on a single thread, formats records there, and writes
+everything that is waiting as one batch to stdout or a size-rotated file.
+``LogPipeline.stop`` drains and flushes everything still queued.
+"""
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
+from typing import Any, Dict, List
+
+_STOP = object()
+
+
+class BoundedQueueHandler(QueueHandler):
+    def __init__(self, log_queue: "queue.Queue", policy: str = "drop", block_timeout: float = 0.05):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve %-args now (they may be mutated later) but leave formatting,
+        # including exc_info rendering, to the writer thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class StdoutSink:
+    def __init__(self):
+        self.stream = sys.stdout
+
+    def write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+
+    def close(self) -> None:
+        try:
+            self.stream.flush()
+        except (ValueError, OSError):  # stream already closed at interpreter exit
+            pass
+
+
+class RotatingFileSink:
+    """Appends batches to ``path``, rotating like ``RotatingFileHandler`` (rotation checked per batch)."""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+
+    def write(self, text: str) -> None:
+        handler = self._handler
+        if handler.maxBytes > 0 and handler.stream.tell() + len(text) >= handler.maxBytes and handler.stream.tell() > 0:
+            handler.doRollover()
+        handler.stream.write(text)
+        handler.stream.flush()
+
+    def close(self) -> None:
+        self._handler.close()
+
+
+class BatchingLogWriter(threading.Thread):
+    def __init__(self, log_queue: "queue.Queue", sink, formatter: logging.Formatter, batch_size: int = 256):
+        super().__init__(name="log-writer", daemon=True)
+        self.queue = log_queue
+        self.sink = sink
+        self.formatter = formatter
+        self.batch_size = batch_size
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+
+    def run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[logging.LogRecord] = []
+            item = self.queue.get()
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                self.errors += 1
+        try:
+            self.sink.write("\n".join(lines) + "\n")
+        except Exception:
+            self.errors += len(lines)
+            return
+        self.written += len(lines)
+        self.batches += 1
+
+
+class LogPipeline:
+    def __init__(self, formatter: logging.Formatter, *, capacity: int, policy: str, block_timeout: float,
+                 batch_size: int, file_path: str | None = None, file_max_bytes: int = 0, file_backup_count: int = 0):
+        self.queue: "queue.Queue" = queue.Queue(maxsize=capacity)
+        self.handler = BoundedQueueHandler(self.queue, policy=policy, block_timeout=block_timeout)
+        sink = RotatingFileSink(file_path, file_max_bytes, file_backup_count) if file_path else StdoutSink()
+        self.writer = BatchingLogWriter(self.queue, sink, formatter, batch_size=batch_size)
+        self.writer.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write out everything queued so far, then stop the writer thread."""
+        if not self.writer.is_alive():
+            return
+        self.queue.put(_STOP)  # blocks while full: the writer is draining it
+        self.writer.join(timeout)
+        self.writer.sink.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.handler.policy,
+            "capacity": self.queue.maxsize,
+            "queued": self.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "written": self.writer.written,
+            "batches": self.writer.batches,
+            "write_errors": self.writer.errors,
+        }
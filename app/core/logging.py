@@ -1,8 +1,10 @@
-import logging, sys, json, os
+import logging, logging.handlers, sys, json, os, atexit, random, time
+from contextvars import ContextVar, Token
 from datetime import datetime, timezone
 from app.core.config import settings
+from app.core.log_pipeline import LogPipeline
 from starlette.requests import Request
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable, Union
 
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
@@ -16,7 +18,7 @@ class JsonFormatter(logging.Formatter):
             "line": record.lineno,
         }
         # Include common custom attributes if present
-        for field in ["cid", "method", "path", "status", "duration_ms", "user_id", "client_addr"]:
+        for field in ["cid", "method", "path", "status", "duration_ms", "user_id", "client_addr", "steps"]:
             if hasattr(record, field):
                 data[field] = getattr(record, field)
         # Uvicorn access log specific attributes
@@ -37,14 +39,102 @@ class JsonFormatter(logging.Formatter):
             data["exc"] = self.formatException(record.exc_info)
         return json.dumps(data, ensure_ascii=False)
 
+try:  # optional fast encoder (pip install orjson)
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Custom record attributes copied into the JSON line, in output order
+_EXTRA_FIELDS = ("cid", "method", "path", "status", "duration_ms", "user_id", "client_addr", "steps")
+
+def _dumps(data: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+class FastJsonFormatter(logging.Formatter):
+    """Same output as ``JsonFormatter`` at a fraction of the cost.
+
+    Reads extras straight from ``record.__dict__`` against a fixed field list,
+    renders the timestamp from a per-second cached prefix, and encodes with
+    orjson when installed.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._ts_cache = (-1, "")  # (epoch second, "YYYY-MM-DDTHH:MM:SS")
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        cached_second, prefix = self._ts_cache
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._ts_cache = (second, prefix)
+        micros = int(round((created - second) * 1_000_000))
+        if micros >= 1_000_000:  # rounding spilled into the next second
+            return self._timestamp(second + 1)
+        return f"{prefix}.{micros:06d}Z" if micros else f"{prefix}Z"
+
+    def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
+        attrs = record.__dict__
+        data = {
+            "ts": self._timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "module": record.module,
+            "func": record.funcName,
+            "line": record.lineno,
+        }
+        for field in _EXTRA_FIELDS:
+            if field in attrs:
+                data[field] = attrs[field]
+        # Uvicorn access log specific attributes
+        if "status_code" in attrs and "status" not in data:
+            data["status"] = attrs["status_code"]
+        if "request_line" in attrs:
+            rl = attrs["request_line"]
+            try:
+                method, remainder = rl.split(" ", 1)
+                data.setdefault("method", method)
+                data.setdefault("path", remainder.rsplit(" ", 1)[0])
+            except Exception:
+                data.setdefault("request_line", rl)
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return _dumps(data)
+
+_pipeline: Optional[LogPipeline] = None
+
 def setup_logging():
+    global _pipeline
     level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
     root = logging.getLogger()
+    shutdown_logging(fallback=False)
     # Remove all existing handlers to avoid duplicates / default formatting
     for h in list(root.handlers):
         root.removeHandler(h)
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JsonFormatter())
+    if settings.LOG_PIPELINE == "queue":
+        # Request threads only enqueue; formatting and I/O happen on the writer thread
+        _pipeline = LogPipeline(
+            FastJsonFormatter(),
+            capacity=settings.LOG_QUEUE_SIZE,
+            policy=settings.LOG_QUEUE_FULL_POLICY,
+            block_timeout=settings.LOG_QUEUE_BLOCK_TIMEOUT_SECONDS,
+            batch_size=settings.LOG_BATCH_SIZE,
+            file_path=settings.LOG_FILE,
+            file_max_bytes=settings.LOG_FILE_MAX_BYTES,
+            file_backup_count=settings.LOG_FILE_BACKUP_COUNT,
+        )
+        handler: logging.Handler = _pipeline.handler
+    elif settings.LOG_FILE:
+        handler = logging.handlers.RotatingFileHandler(
+            settings.LOG_FILE, maxBytes=settings.LOG_FILE_MAX_BYTES, backupCount=settings.LOG_FILE_BACKUP_COUNT, encoding="utf-8"
+        )
+        handler.setFormatter(FastJsonFormatter())
+    else:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(FastJsonFormatter())
     root.addHandler(handler)
     root.setLevel(level)
     # Normalize uvicorn / gunicorn loggers to propagate to root with JSON
@@ -54,9 +144,78 @@ def setup_logging():
         lg.propagate = True
         lg.setLevel(level)
 
+def shutdown_logging(fallback: bool = True):
+    """Flush and stop the queue pipeline (called from the app lifespan and at exit).
+
+    With ``fallback`` the root logger switches to inline stdout writes, so records
+    emitted during the rest of shutdown are not lost.
+    """
+    global _pipeline
+    if _pipeline is None:
+        return
+    root = logging.getLogger()
+    root.removeHandler(_pipeline.handler)
+    _pipeline.stop()
+    _pipeline = None
+    if fallback:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(FastJsonFormatter())
+        root.addHandler(handler)
+
+atexit.register(shutdown_logging)
+
+def logging_stats() -> Dict[str, Any]:
+    return _pipeline.stats() if _pipeline is not None else {"pipeline": "sync"}
+
+class StepBuffer:
+    """Business steps of one request (LOG_BUSINESS_MODE=summary), emitted with its request_end record."""
+    __slots__ = ("cid", "started", "steps", "escalated", "closed")
+
+    def __init__(self, cid: str):
+        self.cid = cid
+        self.started = time.perf_counter()
+        self.steps: List[Dict[str, Any]] = []
+        self.escalated = False  # a warning/error step was logged
+        # Set once the summary is out; later steps (e.g. while a streaming body is sent) log normally
+        self.closed = False
+
+    def add(self, step: str, level: str) -> None:
+        entry: Dict[str, Any] = {"step": step, "ms": round((time.perf_counter() - self.started) * 1000, 2)}
+        if level != "info":
+            entry["level"] = level
+            self.escalated = True
+        self.steps.append(entry)
+
+    def should_emit(self, status_code: int) -> bool:
+        """Failures and requests with warnings always; successful ones at LOG_SUMMARY_SAMPLE_RATE."""
+        if self.escalated or status_code >= 400:
+            return True
+        rate = settings.LOG_SUMMARY_SAMPLE_RATE
+        return rate >= 1 or random.random() < rate
+
+_step_buffer: ContextVar[Optional[StepBuffer]] = ContextVar("business_steps", default=None)
+
+def summary_mode() -> bool:
+    return settings.LOG_BUSINESS_MODE == "summary"
+
+def begin_request_steps(cid: str) -> Token:
+    return _step_buffer.set(StepBuffer(cid))
+
+def current_request_steps() -> Optional[StepBuffer]:
+    return _step_buffer.get()
+
+def end_request_steps(token: Token) -> StepBuffer:
+    buffer = _step_buffer.get()
+    _step_buffer.reset(token)
+    buffer.closed = True
+    return buffer
+
+_LEVELS = {"debug": logging.DEBUG, "info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR, "critical": logging.CRITICAL}
+_business_logger = logging.getLogger("business")
+
 def log_business_step(
     step: str,
-    details: Optional[Dict[str, Any]] = None,
+    details: Optional[Union[Dict[str, Any], Callable[[], Dict[str, Any]]]] = None,
     request: Optional[Request] = None,
     user_id: Optional[int] = None,
     level: str = "info"
@@ -66,13 +225,26 @@ def log_business_step(
     
     Args:
         step: Description of the business step (e.g., "user_registration_start")
-        details: Additional context data
+        details: Additional context data, or a callable returning it; a callable is
+            only invoked when the record is actually emitted
         request: Request object to extract correlation ID
         user_id: User ID if available
         level: Log level (info, warning, error)
     """
-    logger = logging.getLogger("business")
-    
+    level = level.lower()
+    buffer = _step_buffer.get()
+    if buffer is not None and not buffer.closed:
+        # Summary mode: record the step; only warnings/errors are also logged right away
+        buffer.add(step, level)
+        if level in ("info", "debug"):
+            return
+
+    levelno = _LEVELS.get(level, logging.INFO)
+    if not _business_logger.isEnabledFor(levelno):
+        return
+    if callable(details):
+        details = details()
+
     extra_data = {
         "business_step": step,
         **(details or {})
@@ -88,6 +260,4 @@ def log_business_step(
     elif request and hasattr(request.state, 'user_id'):
         extra_data["user_id"] = request.state.user_id
     
-    # Log at appropriate level
-    log_method = getattr(logger, level.lower(), logger.info)
-    log_method(f"Business: {step}", extra=extra_data)
+    _business_logger.log(levelno, f"Business: {step}", extra=extra_data)
@@ -0,0 +1,265 @@
+"""HTTP middleware.
+
+``RequestContextMiddleware`` is the production stack: a single pure-ASGI layer
+that assigns the correlation id, sets timing and security headers, and logs
+request start/end in one pass without wrapping the response stream. The three
+``BaseHTTPMiddleware`` classes below it are the previous stack, kept for
+``MIDDLEWARE_STACK=legacy`` and the middleware benchmark.
+
+``ReadYourWritesMiddleware`` runs with either stack and hands the time of a
+request's committed write back to the client for replica routing.
+"""
+import logging
+import time
+import uuid
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import begin_request_steps, current_request_steps, end_request_steps, summary_mode
+
+logger = logging.getLogger("app")
+
+DOC_PATH_PREFIXES = ("/docs", "/redoc", "/openapi.json")
+
+LAST_WRITE_HEADER = "X-Last-Write"
+LAST_WRITE_COOKIE = "last_write"
+
+class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response: Response = await call_next(request)
+        response.headers.setdefault("X-Content-Type-Options", "nosniff")
+        response.headers.setdefault("X-Frame-Options", "DENY")
+        response.headers.setdefault("X-XSS-Protection", "0")
+        response.headers.setdefault("Referrer-Policy", "same-origin")
+        # Relax CSP for docs so Swagger/ReDoc assets & inline styles/scripts load
+        if request.url.path.startswith(DOC_PATH_PREFIXES):
+            # Allow swagger/redoc external CDN assets
+            csp = (
+                "default-src 'self'; "
+                "script-src 'self' 'unsafe-inline' 'unsafe-eval' https:; "
+                "style-src 'self' 'unsafe-inline' https:; "
+                "img-src 'self' data: https:; "
+                "font-src 'self' data: https:; "
+                "connect-src 'self' https:;"
+            )
+        else:
+            csp = "default-src 'self'"
+        response.headers["Content-Security-Policy"] = csp
+        return response
+
+class RequestTimingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start = time.time()
+        response: Response = await call_next(request)
+        duration = (time.time() - start) * 1000
+        response.headers["X-Process-Time-ms"] = f"{duration:.2f}"
+        return response
+
+class RequestLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        cid = str(uuid.uuid4())
+        request.state.correlation_id = cid
+        client = request.client.host if request.client else None
+        # Summary mode: business steps collect in a per-request buffer and ride on request_end
+        steps_token = begin_request_steps(cid) if summary_mode() else None
+        if steps_token is None:
+            logger.info(
+                "request_start",
+                extra={
+                    "cid": cid,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "client_addr": client,
+                },
+            )
+        start = time.time()
+        try:
+            response = await call_next(request)
+        except Exception:
+            duration = (time.time() - start) * 1000
+            user_id = getattr(request.state, "user_id", None)
+            steps = end_request_steps(steps_token).steps if steps_token is not None else None
+            logger.exception(
+                "request_error",
+                extra={
+                    "cid": cid,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "client_addr": client,
+                    "duration_ms": round(duration, 2),
+                    "user_id": user_id,
+                    **({"steps": steps} if steps is not None else {}),
+                },
+            )
+            raise
+        duration = (time.time() - start) * 1000
+        user_id = getattr(request.state, "user_id", None)
+        extra = {
+            "cid": cid,
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "client_addr": client,
+            "duration_ms": round(duration, 2),
+            "user_id": user_id,
+        }
+        if steps_token is None:
+            logger.info("request_end", extra=extra)
+        else:
+            buffer = end_request_steps(steps_token)
+            if buffer.should_emit(response.status_code):
+                logger.info("request_end", extra={**extra, "steps": buffer.steps})
+        response.headers["X-Correlation-Id"] = cid
+        return response
+
+
+_CSP_DEFAULT = b"default-src 'self'"
+# Relax CSP for docs so Swagger/ReDoc assets & inline styles/scripts load
+_CSP_DOCS = (
+    b"default-src 'self'; "
+    b"script-src 'self' 'unsafe-inline' 'unsafe-eval' https:; "
+    b"style-src 'self' 'unsafe-inline' https:; "
+    b"img-src 'self' data: https:; "
+    b"font-src 'self' data: https:; "
+    b"connect-src 'self' https:;"
+)
+# Added unless the endpoint already set them
+_SECURITY_DEFAULTS = (
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"0"),
+    (b"referrer-policy", b"same-origin"),
+)
+
+
+class RequestContextMiddleware:
+    """Correlation id, X-Process-Time-ms, security headers and request logging in one ASGI layer.
+
+    Durations come from ``time.perf_counter`` (monotonic). ``X-Process-Time-ms``
+    covers the time until the response headers are sent; ``request_end``
+    is logged once the last body chunk went out, so streamed responses report
+    their full duration.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cid = str(uuid.uuid4())
+        state = scope.setdefault("state", {})
+        state["correlation_id"] = cid
+        path = scope["path"]
+        client = scope["client"][0] if scope.get("client") else None
+        # Summary mode: business steps collect in a per-request buffer and ride on request_end
+        steps_token = begin_request_steps(cid) if summary_mode() else None
+        steps = current_request_steps() if steps_token is not None else None
+        if steps is None:
+            logger.info(
+                "request_start",
+                extra={"cid": cid, "method": scope["method"], "path": path, "client_addr": client},
+            )
+        csp = _CSP_DOCS if path.startswith(DOC_PATH_PREFIXES) else _CSP_DEFAULT
+        start = time.perf_counter()
+        status_code = 500
+        logged = False
+
+        def log_end() -> None:
+            # May run in a child task (streaming responses), so it only closes the
+            # step buffer; the context variable itself is reset in __call__.
+            nonlocal logged
+            logged = True
+            extra = {
+                "cid": cid,
+                "method": scope["method"],
+                "path": path,
+                "status": status_code,
+                "client_addr": client,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "user_id": state.get("user_id"),
+            }
+            if steps is None:
+                logger.info("request_end", extra=extra)
+            else:
+                steps.closed = True
+                if steps.should_emit(status_code):
+                    logger.info("request_end", extra={**extra, "steps": steps.steps})
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = message.setdefault("headers", [])
+                present = {name.lower() for name, _ in headers}
+                for name, value in _SECURITY_DEFAULTS:
+                    if name not in present:
+                        headers.append((name, value))
+                headers = [(name, value) for name, value in headers if name.lower() != b"content-security-policy"]
+                headers.append((b"content-security-policy", csp))
+                headers.append((b"x-process-time-ms", f"{(time.perf_counter() - start) * 1000:.2f}".encode()))
+                headers.append((b"x-correlation-id", cid.encode()))
+                message["headers"] = headers
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not logged:
+                log_end()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            logged = True
+            logger.exception(
+                "request_error",
+                extra={
+                    "cid": cid,
+                    "method": scope["method"],
+                    "path": path,
+                    "client_addr": client,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                    "user_id": state.get("user_id"),
+                    **({"steps": steps.steps} if steps is not None else {}),
+                },
+            )
+            raise
+        finally:
+            if steps_token is not None:
+                end_request_steps(steps_token)
+        if not logged:  # e.g. the client disconnected before the body completed
+            log_end()
+
+
+class ReadYourWritesMiddleware:
+    """Return the time of the request's committed write as ``X-Last-Write`` and a cookie.
+
+    The session records it in ``request.state.last_write_at``; clients send it
+    back (browsers through the cookie, which expires with the window) so that
+    ``get_read_db`` keeps their reads on the primary in every worker process.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.window_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+        state = scope.setdefault("state", {})
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.get("last_write_at") is not None:
+                value = f"{state['last_write_at']:.6f}"
+                max_age = max(1, round(self.window_seconds))
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (LAST_WRITE_HEADER.lower().encode(), value.encode()),
+                    (b"set-cookie", f"{LAST_WRITE_COOKIE}={value}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax".encode()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,104 @@
+"""Bounded executor for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (tens of ms of CPU per call). Running it on the
+request threadpool lets a login burst occupy every worker thread and every
+core, stalling unrelated endpoints. Instead, all password work goes through a
+small dedicated thread pool (bcrypt releases the GIL, so threads hash in
+parallel) with a hard cap on queued jobs: when PASSWORD_HASH_WORKERS +
+PASSWORD_HASH_MAX_QUEUE jobs are already pending, new ones fail fast with 503
+instead of piling up. Sync routes block on the result, so the cap also bounds
+how many request threads auth can hold; async routes await it without holding
+a thread at all.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+
+class PasswordHashPool:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_pending = workers + max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_ms_total = 0.0
+        self.queue_ms_max = 0.0
+        self.hash_ms_total = 0.0
+        self.hash_ms_max = 0.0
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+        return self._executor.submit(self._timed, time.perf_counter(), fn, *args)
+
+    def _timed(self, submitted: float, fn: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            queue_ms, hash_ms = (started - submitted) * 1000, (finished - started) * 1000
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                self.queue_ms_total += queue_ms
+                self.queue_ms_max = max(self.queue_ms_max, queue_ms)
+                self.hash_ms_total += hash_ms
+                self.hash_ms_max = max(self.hash_ms_max, hash_ms)
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            done = self.completed
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "completed": done,
+                "rejected": self.rejected,
+                "queue_ms_avg": round(self.queue_ms_total / done, 3) if done else None,
+                "queue_ms_max": round(self.queue_ms_max, 3),
+                "hash_ms_avg": round(self.hash_ms_total / done, 3) if done else None,
+                "hash_ms_max": round(self.hash_ms_max, 3),
+            }
+
+
+hash_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+
+def hash_password(password: str) -> str:
+    return hash_pool.run(get_password_hash, password)
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    return hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run_async(get_password_hash, password)
+
+
+async def check_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hash_pool.run_async(verify_password, plain_password, hashed_password)
@@ -1,9 +1,12 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 from fastapi import HTTPException, status
 from jose import jwt, JWTError, ExpiredSignatureError
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -25,9 +28,21 @@ def create_access_token(data: Dict[str, Any], expires_minutes: int | None = None
     return encoded_jwt
 
 
+# Payloads of tokens that already passed verification, keyed by the token's SHA-256
+# digest; each entry lives until the token's own ``exp``.
+verified_tokens = TTLCache(maxsize=settings.JWT_DECODE_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
 def decode_token(token: str) -> Dict[str, Any]:
+    key = hashlib.sha256(token.encode()).digest()
+    cached = verified_tokens.get(key)
+    if cached is not None:
+        return dict(cached)
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            verified_tokens.set(key, dict(payload), ttl=exp - time.time())
         return payload
     except ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
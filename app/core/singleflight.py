@@ -0,0 +1,120 @@
+"""Single-flight coalescing of identical concurrent calls.
+
+The first caller for a key (the leader) runs the function; callers arriving
+with the same key while it is in flight wait for it and get the same result,
+or the same exception. Nothing is kept once the call finishes, so this is not
+a cache: a caller arriving a moment later runs the function again.
+
+``SingleFlight`` is for threadpool code (sync routes), ``AsyncSingleFlight``
+for coroutines on the event loop. Results are shared between callers, so they
+must not be mutated.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Counters:
+    def __init__(self):
+        self.executions = 0  # calls that ran the function
+        self.coalesced = 0   # calls that waited for another caller's execution
+        self.errors = 0
+
+    def stats(self, in_flight: int) -> Dict[str, Any]:
+        calls = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": in_flight,
+            "coalesced_ratio": round(self.coalesced / calls, 4) if calls else None,
+        }
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(_Counters):
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, Any]:
+        return super().stats(len(self._calls))
+
+
+class AsyncSingleFlight(_Counters):
+    def __init__(self):
+        super().__init__()
+        self._calls: Dict[Hashable, "asyncio.Future"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        while True:
+            future = self._calls.get(key)
+            if future is None or future.get_loop() is not loop:
+                break
+            self.coalesced += 1
+            try:
+                # shield: a waiter being cancelled must not cancel the shared execution
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this waiter itself was cancelled
+                # The leader was cancelled (e.g. its client went away): take over
+                self.coalesced -= 1
+
+        future = self._calls[key] = loop.create_future()
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            self.errors += 1
+            future.set_exception(exc)
+            future.exception()  # retrieved here, so an unawaited future logs no warning
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return super().stats(len(self._calls))
@@ -1,3 +1,5 @@
 # Import all models here for Alembic's autogenerate to detect them.
 from app.models.user import User  # noqa: F401
 from app.models.task import Task  # noqa: F401
+from app.models.token_epoch import UserTokenEpoch  # noqa: F401
+from app.models.task_stats import TaskStats  # noqa: F401
@@ -0,0 +1,110 @@
+"""Connection-pool instrumentation exposed on GET /admin/diagnostics/db-pool.
+
+Engines are built by ``create_instrumented_engine``. Their pool class is a
+subclass of the dialect's default (``PoolMetrics.pool_class``) that times every
+checkout (the wait for a free or new connection) and counts checkout timeouts;
+``engine.dispose()`` recreates the pool from its class, so the timing survives
+it. Connection churn is counted through pool events, and the live in-use /
+idle / overflow gauges are read from the engine's current pool.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+
+# Upper bounds (ms) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.engine: Engine | None = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.connects = 0
+        self.invalidations = 0
+
+    def pool_class(self, base: type) -> type:
+        """``base`` with every checkout timed into these metrics."""
+        metrics = self
+
+        def _do_get(pool):
+            start = time.perf_counter()
+            try:
+                return base._do_get(pool)
+            except exc.TimeoutError:
+                with metrics._lock:
+                    metrics.checkout_timeouts += 1
+                raise
+            finally:
+                metrics._record_wait((time.perf_counter() - start) * 1000)
+
+        return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+    def attach(self, engine: Engine) -> "PoolMetrics":
+        """Read gauges from ``engine`` and count its connects and invalidations.
+
+        Pool event listeners are carried over when the pool is recreated.
+        """
+        self.engine = engine
+        event.listen(engine.pool, "connect", self._on_connect)
+        event.listen(engine.pool, "invalidate", self._on_invalidate)
+        return self
+
+    def _record_wait(self, wait_ms: float) -> None:
+        bucket = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait_ms <= bound), len(WAIT_BUCKETS_MS))
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            self.wait_buckets[bucket] += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.engine.pool if self.engine is not None else None
+        gauges: Dict[str, Any] = {"pool_class": type(pool).__name__ if pool is not None else None}
+        # Only queue-style pools report sizing gauges
+        for gauge, method in (("size", "size"), ("in_use", "checkedout"), ("idle", "checkedin"), ("overflow", "overflow")):
+            fn = getattr(pool, method, None)
+            gauges[gauge] = fn() if callable(fn) else None
+        labels = [f"le_{b}ms" for b in WAIT_BUCKETS_MS] + ["gt_%dms" % WAIT_BUCKETS_MS[-1]]
+        with self._lock:
+            return {
+                **gauges,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_ms_avg": round(self.wait_ms_total / self.checkouts, 3) if self.checkouts else None,
+                "checkout_wait_ms_max": round(self.wait_ms_max, 3),
+                "checkout_wait_histogram": dict(zip(labels, self.wait_buckets)),
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+# name -> metrics for every instrumented engine (filled in by app.db.session)
+registry: Dict[str, PoolMetrics] = {}
+
+
+def create_instrumented_engine(name: str, url: str, create: Callable[..., Any] = create_engine, **kwargs: Any):
+    """``create(url, **kwargs)`` (``create_engine`` or ``create_async_engine``) with its pool
+    instrumented and registered as ``name``."""
+    metrics = registry[name] = PoolMetrics(name)
+    parsed = make_url(url)
+    base = kwargs.pop("poolclass", None) or parsed.get_dialect().get_pool_class(parsed)
+    engine = create(url, poolclass=metrics.pool_class(base), **kwargs)
+    metrics.attach(getattr(engine, "sync_engine", engine))
+    return engine
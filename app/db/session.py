@@ -1,10 +1,37 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.cache import TTLCache
 from app.core.config import settings
-from typing import Generator
+from app.db import pool_metrics
+from typing import Any, AsyncGenerator, Dict, Generator, List
+
+
+def pool_options(url: str) -> Dict[str, Any]:
+    """Engine keyword arguments for the DB_POOL_* settings.
+
+    In-memory SQLite uses a per-thread singleton pool that has no size/overflow/timeout
+    knobs, so only the generic options apply there.
+    """
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "pool_recycle": settings.DB_POOL_RECYCLE}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
 
 # Create SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL, echo=False, future=True)
+engine = pool_metrics.create_instrumented_engine(
+    "primary", settings.DATABASE_URL, echo=False, future=True, **pool_options(settings.DATABASE_URL)
+)
 
 # Session factory
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
@@ -15,3 +42,143 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+# --- Read replicas (DATABASE_REPLICA_URLS) ------------------------------------
+# Read-only endpoints take their session from ``open_replica_session`` (via the
+# ``get_read_db`` dependency); everything else stays on the primary. A user who
+# committed a write within DB_READ_YOUR_WRITES_SECONDS keeps reading from the
+# primary so replica lag never hides their own changes. The write time travels
+# with the client (X-Last-Write header and cookie, set by ReadYourWritesMiddleware
+# in app/core/middleware.py), so the pin holds whichever worker serves the
+# next read; each process also remembers its own recent writers for clients
+# that send neither back.
+
+replica_engines: List = []
+_replica_sessions: List[sessionmaker] = []
+_round_robin = itertools.count()
+_recent_writers = TTLCache(maxsize=100000, ttl=settings.DB_READ_YOUR_WRITES_SECONDS)  # user ids written here lately
+
+
+def configure_replicas(urls: List[str]) -> None:
+    """(Re)build the replica engines; called at import with settings.replica_urls."""
+    for old in replica_engines:
+        old.dispose()
+    for name in [n for n in pool_metrics.registry if n.startswith("replica")]:
+        del pool_metrics.registry[name]
+    replica_engines[:] = [
+        pool_metrics.create_instrumented_engine(f"replica{i}", url, echo=False, future=True, **pool_options(url))
+        for i, url in enumerate(urls)
+    ]
+    _replica_sessions[:] = [
+        sessionmaker(bind=e, autoflush=False, autocommit=False, future=True) for e in replica_engines
+    ]
+
+
+def _pick_replica() -> int:
+    if settings.DB_REPLICA_STRATEGY == "least_busy":
+        return min(range(len(replica_engines)), key=lambda i: getattr(replica_engines[i].pool, "checkedout", int)())
+    return next(_round_robin) % len(replica_engines)
+
+
+def mark_recent_write(user_id: int) -> None:
+    _recent_writers.set(user_id, True)
+
+
+def parse_last_write(value: str | None) -> float | None:
+    """The Unix time carried by the X-Last-Write header or cookie, if any."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def reads_pinned_to_primary(user_id: int | None, last_write_at: float | None = None) -> bool:
+    if last_write_at is not None and time.time() - last_write_at < settings.DB_READ_YOUR_WRITES_SECONDS:
+        return True
+    return user_id is not None and _recent_writers.get(user_id) is not None
+
+
+def open_replica_session(user_id: int | None = None, last_write_at: float | None = None) -> Session | None:
+    """A session on a replica, or None when reads for this user must go to the primary."""
+    if not replica_engines or reads_pinned_to_primary(user_id, last_write_at):
+        return None
+    return _replica_sessions[_pick_replica()]()
+
+
+def read_target(session) -> str:
+    """``"replica"`` or ``"primary"``: where reads on ``session`` (sync or async) are served from."""
+    return "replica" if session.get_bind() in replica_engines else "primary"
+
+
+# Sessions tagged with info["user_id"] (set by get_current_user) record a write on
+# commit if they flushed ORM changes or ran an INSERT/UPDATE/DELETE statement; the
+# commit time also goes on info["request_state"] for ReadYourWritesMiddleware.
+@event.listens_for(Session, "after_flush")
+def _flagged_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flagged_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session):
+    if session.info.pop("wrote", False) and session.info.get("user_id") is not None:
+        mark_recent_write(session.info["user_id"])
+        if (state := session.info.get("request_state")) is not None:
+            state.last_write_at = time.time()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_write(session):
+    session.info.pop("wrote", None)
+
+
+configure_replicas(settings.replica_urls)
+
+
+# --- Async stack (DB_STACK=async) -------------------------------------------
+# Created lazily so the sync deployment needs neither greenlet nor an async driver.
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver (psycopg2 -> asyncpg, pysqlite -> aiosqlite)."""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+        _async_engine = pool_metrics.create_instrumented_engine(
+            "async", url, create=create_async_engine, echo=False, **pool_options(url)
+        )
+        _AsyncSessionLocal = async_sessionmaker(bind=_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+def get_async_sessionmaker():
+    get_async_engine()
+    return _AsyncSessionLocal
+
+
+async def get_async_db() -> AsyncGenerator:
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -1,10 +1,18 @@
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Enum as SAEnum, Text, Date
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Enum as SAEnum, Text, Date, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
+from datetime import datetime, timezone
 import enum
 
 from app.models.user import Base
 
+
+def _utcnow() -> datetime:
+    # Python-side default keeps sub-second precision on every backend so
+    # (created_at, id) is a usable keyset for cursor pagination and updated_at
+    # changes on every write (it versions the task's ETag).
+    return datetime.now(timezone.utc)
+
 class TaskStatus(str, enum.Enum):
     pending = "pending"
     in_progress = "in_progress"
@@ -12,14 +20,37 @@ class TaskStatus(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Shaped after list_tasks: owner (or admin-wide) scope, optional status and
+    # due_date range, ordered by (created_at, id). See the task_indexes migration.
+    # ix_tasks_owner_updated answers the list ETag aggregate (task_updated_index).
+    __table_args__ = (
+        Index("ix_tasks_owner_created", "owner_id", "created_at", "id"),
+        Index("ix_tasks_owner_updated", "owner_id", "updated_at"),
+        Index("ix_tasks_owner_status_created", "owner_id", "status", "created_at", "id"),
+        Index(
+            "ix_tasks_owner_due",
+            "owner_id",
+            "due_date",
+            postgresql_where=text("due_date IS NOT NULL"),
+            sqlite_where=text("due_date IS NOT NULL"),
+        ),
+        Index("ix_tasks_created", "created_at", "id"),
+        Index("ix_tasks_status_created", "status", "created_at", "id"),
+        Index(
+            "ix_tasks_due",
+            "due_date",
+            postgresql_where=text("due_date IS NOT NULL"),
+            sqlite_where=text("due_date IS NOT NULL"),
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     due_date: Mapped[Date | None] = mapped_column(Date, nullable=True)
     status: Mapped[TaskStatus] = mapped_column(SAEnum(TaskStatus), default=TaskStatus.pending, nullable=False)
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=_utcnow, server_default=func.now(), nullable=False)
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), default=_utcnow, server_default=func.now(), onupdate=_utcnow, nullable=False)
 
     owner = relationship("User", back_populates="tasks")
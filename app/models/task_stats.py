@@ -0,0 +1,21 @@
+from sqlalchemy import ForeignKey, Integer, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.user import Base
+
+
+class TaskStats(Base):
+    """Per-owner task counts by status, kept in step with ``tasks`` by ``task_stats_service``.
+
+    Every task write adjusts these counters in the same transaction, so reading
+    a user's statistics is a primary-key lookup. ``task_stats_service.rebuild``
+    recomputes them from ``tasks`` if they ever drift.
+    """
+    __tablename__ = "task_stats"
+
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, autoincrement=False
+    )
+    pending: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    in_progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    done: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
@@ -0,0 +1,17 @@
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.user import Base
+
+
+class UserTokenEpoch(Base):
+    """Per-user revocation counter embedded in stateless tokens (AUTH_STATELESS).
+
+    Bumping ``epoch`` invalidates every token issued before. There is deliberately
+    no foreign key to ``users``: the row must outlive a deleted user so that user's
+    outstanding tokens stay revoked.
+    """
+    __tablename__ = "user_token_epochs"
+
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    epoch: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,7 +1,9 @@
 from datetime import datetime, date
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List
 
+from app.core.config import settings
+
 class TaskBase(BaseModel):
     title: str
     description: str | None = None
@@ -33,7 +35,51 @@ class TaskRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 class PaginatedTasks(BaseModel):
-    total: int
+    total: int | None  # None when requested with include_total=false
+    total_is_estimate: bool = False
     items: List[TaskRead]
+    next_cursor: str | None = None  # pass back as ?cursor= to fetch the following page
 
     model_config = ConfigDict(from_attributes=True)
+
+class TaskStatsRead(BaseModel):
+    pending: int
+    in_progress: int
+    done: int
+    total: int
+    overdue: int  # due before today and not done
+
+class TaskBulkCreate(BaseModel):
+    items: List[TaskCreate] = Field(min_length=1, max_length=settings.TASK_BULK_MAX_ITEMS)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkUpdate(BaseModel):
+    items: List[TaskBulkUpdateItem] = Field(min_length=1, max_length=settings.TASK_BULK_MAX_ITEMS)
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=settings.TASK_BULK_MAX_ITEMS)
+
+class TaskBulkItemResult(BaseModel):
+    index: int  # position in the request
+    id: int | None = None
+    status: str  # created | updated | deleted | not_found | forbidden | invalid
+    detail: str | None = None
+    task: TaskRead | None = None
+
+class TaskBulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBulkItemResult]
+
+class TaskImportError(BaseModel):
+    line: int
+    error: str
+
+class TaskImportResult(BaseModel):
+    rows_read: int
+    imported: int
+    failed: int
+    errors: List[TaskImportError]
+    errors_truncated: bool = False
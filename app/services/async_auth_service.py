@@ -0,0 +1,32 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from app.models.user import User, UserRole
+from app.schemas.user import UserCreate
+from app.core.password_pool import check_password_async, hash_password_async
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    return await db.scalar(select(User).where(User.email == email))
+
+
+async def create_user(db: AsyncSession, user_in: UserCreate, role: UserRole = UserRole.user) -> User:
+    existing = await get_user_by_email(db, user_in.email)
+    if existing:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+    await db.rollback()  # don't hold a pooled connection while bcrypt runs
+    # bcrypt is CPU-bound; keep it off the event loop
+    hashed = await hash_password_async(user_in.password)
+    db_user = User(email=user_in.email, hashed_password=hashed, role=role)
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> User:
+    user = await get_user_by_email(db, email)
+    await db.close()  # release the connection before bcrypt; the user stays loaded, detached
+    if not user or not await check_password_async(password, user.hashed_password):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    return user
@@ -0,0 +1,243 @@
+"""``task_service`` for the async stack (``DB_STACK=async``).
+
+Same behaviour and return types as the sync functions; filter building, cursor
+handling, authorization and cache invalidation are shared with ``task_service``.
+"""
+from collections import Counter
+from datetime import date
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.singleflight import AsyncSingleFlight
+from app.db.session import read_target
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.services import task_cache, task_stats_service
+from app.services.task_search import get_search_backend_async
+from app.services.task_service import (
+    ESTIMATE_SQL,
+    LIST_VERSION_COLUMNS,
+    TaskPage,
+    _bad_request,
+    apply_task_filters,
+    decode_cursor,
+    detach_results,
+    encode_cursor,
+    ensure_task_access,
+    estimate_applies,
+    flight_key,
+    task_update_values,
+    usable_estimate,
+)
+
+
+async def create_task(db: AsyncSession, owner: User, task_in: TaskCreate) -> Task:
+    task = Task(
+        owner_id=owner.id,
+        title=task_in.title,
+        description=task_in.description,
+        due_date=task_in.due_date,
+    )
+    db.add(task)
+    await task_stats_service.apply_async(db, Counter({(owner.id, TaskStatus.pending): 1}))
+    await db.commit()
+    await db.refresh(task)
+    task_cache.invalidate_owners([task.owner_id])
+    return task
+
+
+async def get_task_by_id(db: AsyncSession, task_id: int) -> Task | None:
+    return await db.get(Task, task_id)
+
+
+async def get_task_version(db: AsyncSession, task_id: int):
+    return (await db.execute(select(Task.id, Task.owner_id, Task.updated_at).where(Task.id == task_id))).first()
+
+
+# Identical concurrent listing reads share one execution (TASK_READ_COALESCING)
+list_flights = AsyncSingleFlight()
+
+
+async def coalesced(db: AsyncSession, key: tuple, run: Callable[[], Awaitable[Any]]) -> Any:
+    if not settings.TASK_READ_COALESCING:
+        return await run()
+
+    async def leader():
+        return detach_results(db, await run())
+
+    return await list_flights.do(key, leader)
+
+
+async def list_version(
+    db: AsyncSession,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+):
+    filters = dict(q=q, status=status, due_before=due_before, due_after=due_after)
+    return await coalesced(
+        db,
+        flight_key(db, "version", owner, all_tasks, tuple(filters.values())),
+        partial(_list_version, db, owner=owner, all_tasks=all_tasks, **filters),
+    )
+
+
+async def list_tasks(
+    db: AsyncSession,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str | None = None,
+    order_by_relevance: bool = False,
+    include_total: bool = True,
+    known_total: int | None = None,
+) -> TaskPage:
+    filters = dict(q=q, status=status, due_before=due_before, due_after=due_after)
+    page = dict(
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        order_by_relevance=order_by_relevance,
+        include_total=include_total,
+        known_total=known_total,
+    )
+    return await coalesced(
+        db,
+        flight_key(db, "page", owner, all_tasks, tuple(filters.values()) + tuple(page.values())),
+        partial(_list_tasks, db, owner=owner, all_tasks=all_tasks, **filters, **page),
+    )
+
+
+async def _list_version(
+    db: AsyncSession,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+):
+    scope = None if all_tasks or owner is None else owner.id
+    filters = (q, status, due_before, due_after)
+    if estimate_applies(db.bind.dialect.name, scope, filters):
+        return None
+    key = task_cache.count_key(scope, filters, read_target(db))
+    stmt, _ = apply_task_filters(
+        select(Task),
+        search=await get_search_backend_async(db) if q else None,
+        owner=owner,
+        all_tasks=all_tasks,
+        q=q,
+        status=status,
+        due_before=due_before,
+        due_after=due_after,
+    )
+    version = tuple((await db.execute(stmt.with_only_columns(*LIST_VERSION_COLUMNS))).one())
+    task_cache.counts.set(key, (version[1], False))
+    return version
+
+
+async def _list_tasks(
+    db: AsyncSession,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str | None = None,
+    order_by_relevance: bool = False,
+    include_total: bool = True,
+    known_total: int | None = None,
+) -> TaskPage:
+    if cursor and order_by_relevance:
+        raise _bad_request("Cursor pagination is not supported with relevance ordering")
+    seek = decode_cursor(cursor) if cursor else None
+    stmt, rank = apply_task_filters(
+        select(Task),
+        search=await get_search_backend_async(db) if q else None,
+        owner=owner,
+        all_tasks=all_tasks,
+        q=q,
+        status=status,
+        due_before=due_before,
+        due_after=due_after,
+    )
+
+    total, total_is_estimate = (known_total if include_total else None), False
+    if include_total and known_total is None:
+        scope = None if all_tasks or owner is None else owner.id
+        total, total_is_estimate = await _count_tasks(db, stmt, scope, (q, status, due_before, due_after))
+    if seek:
+        stmt = stmt.filter(tuple_(Task.created_at, Task.id) < seek)
+        offset = 0
+    if order_by_relevance and rank is not None:
+        stmt = stmt.order_by(rank, Task.id.desc())
+    else:
+        order_by_relevance = False
+        stmt = stmt.order_by(Task.created_at.desc(), Task.id.desc())
+    rows = (await db.scalars(stmt.offset(offset).limit(limit + 1))).all()
+    tasks = list(rows[:limit])
+    has_more = len(rows) > limit and tasks
+    next_cursor = encode_cursor(tasks[-1]) if has_more and not order_by_relevance else None
+    return TaskPage(total, tasks, next_cursor, total_is_estimate)
+
+
+async def _count_tasks(db: AsyncSession, stmt, owner_id: int | None, filters: tuple):
+    key = task_cache.count_key(owner_id, filters, read_target(db))
+    cached = task_cache.counts.get(key)
+    if cached is not None:
+        return cached
+    result = None
+    if estimate_applies(db.bind.dialect.name, owner_id, filters):
+        estimate = usable_estimate(await db.scalar(ESTIMATE_SQL))
+        result = None if estimate is None else (estimate, True)
+    if result is None:
+        result = (await db.scalar(select(func.count()).select_from(stmt.subquery())), False)
+    task_cache.counts.set(key, result)
+    return result
+
+
+async def update_task(db: AsyncSession, *, task: Task, task_in: TaskUpdate, current_user: User) -> Task:
+    ensure_task_access(task, current_user)
+
+    values = task_update_values(task_in)
+    if values.get("status") is not None:
+        previous = await db.scalar(task_stats_service.locked_status_query(task.id))
+        await task_stats_service.apply_async(db, task_stats_service.status_change(task.owner_id, previous, values["status"]))
+    for field, value in values.items():
+        setattr(task, field, value)
+
+    db.add(task)
+    await db.commit()
+    await db.refresh(task)
+    task_cache.invalidate_owners([task.owner_id])
+    return task
+
+
+async def delete_task(db: AsyncSession, *, task: Task, current_user: User) -> None:
+    ensure_task_access(task, current_user)
+    previous = await db.scalar(task_stats_service.locked_status_query(task.id))
+    await db.delete(task)
+    await task_stats_service.apply_async(db, task_stats_service.status_change(task.owner_id, previous, None))
+    await db.commit()
+    task_cache.invalidate_owners([task.owner_id])
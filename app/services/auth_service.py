@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.password_pool import check_password, hash_password
 
 
 def get_user_by_email(db: Session, email: str) -> User | None:
@@ -13,7 +13,8 @@ def create_user(db: Session, user_in: UserCreate, role: UserRole = UserRole.user
     existing = get_user_by_email(db, user_in.email)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    db_user = User(email=user_in.email, hashed_password=get_password_hash(user_in.password), role=role)
+    db.rollback()  # end the read transaction so no pooled connection is held while bcrypt runs
+    db_user = User(email=user_in.email, hashed_password=hash_password(user_in.password), role=role)
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
@@ -22,6 +23,9 @@ def create_user(db: Session, user_in: UserCreate, role: UserRole = UserRole.user
 
 def authenticate_user(db: Session, email: str, password: str) -> User:
     user = get_user_by_email(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+    # Return the connection to the pool before the slow bcrypt check; close() detaches
+    # the loaded user without expiring it and the session stays usable.
+    db.close()
+    if not user or not check_password(password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     return user
@@ -0,0 +1,159 @@
+import csv
+import io
+import json
+from collections import Counter
+from typing import IO, Any, Callable, Dict, Iterator, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskStatus
+from app.schemas.task import TaskCreate, TaskImportError, TaskImportResult
+from app.services import task_cache, task_stats_service
+
+IMPORT_FORMATS = ("csv", "ndjson")
+COPY_COLUMNS = ("owner_id", "title", "description", "due_date", "status")
+
+
+def detect_format(filename: str | None, content_type: str | None = None) -> str | None:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def _invalid_utf8(*texts: str | None) -> bool:
+    # Undecodable bytes survive ``surrogateescape`` decoding as lone surrogates, which do not encode back
+    try:
+        for text in texts:
+            if text:
+                text.encode("utf-8")
+    except UnicodeEncodeError:
+        return True
+    return False
+
+
+def _parse(stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, Dict[str, Any] | str]]:
+    """Yield ``(line_number, record)`` or ``(line_number, error message)`` one row at a time.
+
+    Bytes that are not valid UTF-8 fail their own row rather than the rest of the
+    upload, whose earlier chunks may already be committed.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8", errors="surrogateescape", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            for record in reader:
+                if _invalid_utf8(*record, *(v for v in record.values() if isinstance(v, str))):
+                    yield reader.line_num, "Invalid UTF-8"
+                    continue
+                # Empty CSV cells mean "not set" for the optional fields
+                yield reader.line_num, {k: (v if v != "" else None) for k, v in record.items() if k}
+            return
+        for line_no, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            if _invalid_utf8(line):
+                yield line_no, "Invalid UTF-8"
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"Invalid JSON: {e}"
+                continue
+            yield line_no, record if isinstance(record, dict) else "Expected a JSON object"
+    finally:
+        # Leave the caller's stream open (closing the wrapper would close it too)
+        text.detach()
+
+
+def _copy_field(value: Any) -> str:
+    # In COPY's CSV format an unquoted empty field is NULL and a quoted one ("") an
+    # empty string, so strings are always quoted (csv.writer emits both as empty).
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+def write_task_rows(db: Session, rows: List[Tuple]) -> None:
+    """Insert ``COPY_COLUMNS`` tuples: ``COPY`` on Postgres, one multi-row insert elsewhere; the caller commits."""
+    if db.get_bind().dialect.name == "postgresql":
+        buf = io.StringIO()
+        for owner_id, title, description, due_date, status in rows:
+            fields = (owner_id, title, description, due_date, TaskStatus(status).value)
+            buf.write(",".join(map(_copy_field, fields)) + "\n")
+        buf.seek(0)
+        # created_at/updated_at come from the column server defaults
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY tasks ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buf)
+        finally:
+            cursor.close()
+    else:
+        db.execute(insert(Task), [dict(zip(COPY_COLUMNS, row)) for row in rows])
+
+
+def _write_chunk(db: Session, rows: List[TaskCreate], owner_id: int) -> None:
+    write_task_rows(db, [(owner_id, r.title, r.description, r.due_date, TaskStatus.pending) for r in rows])
+
+
+def import_tasks(
+    db: Session,
+    owner_id: int,
+    stream: IO[bytes],
+    fmt: str,
+    *,
+    chunk_size: int = 5000,
+    max_errors: int = 100,
+    on_progress: Callable[[TaskImportResult], None] | None = None,
+) -> TaskImportResult:
+    """Load tasks for ``owner_id`` from a CSV/NDJSON byte stream.
+
+    The stream is parsed row by row and validated against ``TaskCreate``; valid
+    rows are written and committed one chunk at a time (``COPY`` on Postgres,
+    executemany elsewhere), so memory is bounded by ``chunk_size``. Invalid rows
+    are skipped and reported (the first ``max_errors`` of them with details).
+    ``on_progress`` is called after every committed chunk.
+    """
+    result = TaskImportResult(rows_read=0, imported=0, failed=0, errors=[])
+    chunk: List[TaskCreate] = []
+
+    def flush() -> None:
+        if chunk:
+            _write_chunk(db, chunk, owner_id)
+            task_stats_service.apply(db, Counter({(owner_id, TaskStatus.pending): len(chunk)}))
+            db.commit()
+            task_cache.invalidate_owners([owner_id])
+            result.imported += len(chunk)
+            chunk.clear()
+        if on_progress:
+            on_progress(result)
+
+    for line_no, record in _parse(stream, fmt):
+        result.rows_read += 1
+        error = record if isinstance(record, str) else None
+        if error is None:
+            try:
+                row = TaskCreate.model_validate(record)
+            except ValidationError as e:
+                error = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            else:
+                if row.title.strip():
+                    chunk.append(row)
+                else:
+                    error = "title: must not be blank"
+        if error is not None:
+            result.failed += 1
+            if len(result.errors) < max_errors:
+                result.errors.append(TaskImportError(line=line_no, error=error))
+            else:
+                result.errors_truncated = True
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+    return result
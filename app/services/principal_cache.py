@@ -0,0 +1,43 @@
+"""In-process cache of authenticated principals, keyed by token subject (email).
+
+``get_current_user`` resolves the user from here instead of ``SELECT ... FROM
+users`` on every request. Entries are column snapshots, rebuilt into a ``User``
+that is attached to the request session without a query, so downstream code
+sees an ordinary persistent instance.
+
+``app/api/routes/users.py`` invalidates entries when it changes or deletes a
+user. Each worker keeps its own cache, so a change made through another worker
+(or directly in the database) is picked up after at most
+AUTH_PRINCIPAL_CACHE_TTL_SECONDS.
+"""
+from typing import Any, Dict
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+principals = TTLCache(maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE, ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+
+_COLUMNS = tuple(column.key for column in User.__table__.columns)
+
+
+def remember(user: User) -> None:
+    principals.set(user.email, {key: getattr(user, key) for key in _COLUMNS})
+
+
+def lookup(email: str) -> User | None:
+    """A detached ``User`` rebuilt from the cached snapshot, or None on a miss."""
+    snapshot: Dict[str, Any] | None = principals.get(email)
+    if snapshot is None:
+        return None
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate(*emails: str | None) -> None:
+    for email in emails:
+        if email:
+            principals.pop(email)
@@ -0,0 +1,78 @@
+"""In-process caches derived from the tasks table and their invalidation.
+
+Count entries are keyed by a *generation*: one counter per owner plus a
+global one for admin-wide (``all=true``) views. Every task write through
+``task_service`` bumps the generation of the affected owners and the global
+generation, which makes older entries unreachable; they then age out through
+LRU eviction or their TTL. Generations are per worker process, so a count
+may lag a write served by another worker until its TTL expires
+(TASK_COUNT_CACHE_TTL_SECONDS); a version read (``task_service.list_version``)
+refreshes the entry with the exact count it computes anyway.
+
+Serialized pages are keyed by that version, ``(max(updated_at), count)``,
+which is read from the database, so a write through any worker makes every
+worker miss; ETags are built from the same version.
+"""
+import threading
+from typing import Dict, Hashable, Iterable, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+_lock = threading.Lock()
+_owner_generations: Dict[int, int] = {}
+_global_generation = 0
+
+# (total, is_estimate) per owner/admin scope and normalized filter set
+counts = TTLCache(maxsize=settings.TASK_COUNT_CACHE_SIZE, ttl=settings.TASK_COUNT_CACHE_TTL_SECONDS)
+
+# (etag, JSON body) of a GET /tasks/ page, bounded by the bytes of the bodies
+responses = TTLCache(
+    maxsize=settings.TASK_RESPONSE_CACHE_SIZE if settings.TASK_RESPONSE_CACHE_MAX_BYTES > 0 else 0,
+    ttl=settings.TASK_RESPONSE_CACHE_TTL_SECONDS,
+    maxbytes=settings.TASK_RESPONSE_CACHE_MAX_BYTES,
+    weigh=lambda entry: len(entry[1]),
+)
+
+
+def generation(owner_id: int | None) -> int:
+    """Current generation for an owner's entries, or admin-wide ones when None."""
+    if owner_id is None:
+        return _global_generation
+    return _owner_generations.get(owner_id, 0)
+
+
+def invalidate_owners(owner_ids: Iterable[int]) -> None:
+    global _global_generation
+    with _lock:
+        for owner_id in set(owner_ids):
+            _owner_generations[owner_id] = _owner_generations.get(owner_id, 0) + 1
+        _global_generation += 1
+
+
+def count_key(owner_id: int | None, filters: Tuple[Hashable, ...], target: str = "primary") -> Tuple[Hashable, ...]:
+    """``target`` is where the count was read (``session.read_target``): a replica may lag the primary."""
+    return ("count", owner_id, generation(owner_id), target, filters)
+
+
+def listing_key(
+    owner_id: int | None,
+    role: str,
+    filters: Tuple[Hashable, ...],
+    *,
+    limit: int,
+    offset: int,
+    cursor: str | None,
+    order: str,
+    include_total: bool,
+) -> Tuple[Hashable, ...]:
+    """Normalized identity of a GET /tasks/ page; ``owner_id`` is None for the admin-wide view.
+
+    Together with the listing's ``task_service.list_version`` it keys the cached
+    page and its ETag, so both agree whoever asks and however the query string
+    is spelled.
+    """
+    filters = tuple(f or None for f in filters)  # "" and None filter the same way
+    if cursor:
+        offset = 0  # ignored in cursor mode
+    return ("page", owner_id, role, filters, limit, offset, cursor, order, include_total)
@@ -0,0 +1,153 @@
+"""Pluggable search engines behind the ``q`` filter of ``task_service.list_tasks``.
+
+Each backend narrows a ``Query[Task]`` to rows matching a search string and can
+supply a "best match first" ordering. The index structures they rely on are
+created by the ``task_search`` Alembic migration and are kept in sync by the
+database itself (a generated column on Postgres, triggers on SQLite), so task
+writes through any code path stay searchable.
+
+* ``postgres``: ``tasks.search_vector`` tsvector (GIN) for word matches plus
+  pg_trgm GIN indexes so ``ILIKE '%q%'`` substring matches are index-assisted.
+* ``sqlite_fts``: ``tasks_fts`` FTS5 shadow table with the trigram tokenizer,
+  which answers substring matches of 3+ characters from the index.
+* ``like``: the original unindexed ``ILIKE`` scan; used when the structures
+  above are missing (e.g. a database built with ``create_all``).
+"""
+import weakref
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, or_, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.models.task import Task
+
+if TYPE_CHECKING:  # the async stack is optional (greenlet + async drivers)
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Kept in sync with migrations/versions/3f1c2a9d7b10_task_search.py
+TS_CONFIG = "english"
+
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+)
+
+_tasks_fts = table("tasks_fts", column("rowid"), column("tasks_fts"), column("rank"))
+_search_vector = literal_column("tasks.search_vector")
+
+
+class LikeSearch:
+    name = "like"
+
+    def apply(self, query: Query, q: str) -> Tuple[Query, Optional[ColumnElement]]:
+        like = f"%{q}%"
+        return query.filter(or_(Task.title.ilike(like), Task.description.ilike(like))), None
+
+
+class PostgresSearch:
+    name = "postgres"
+
+    def apply(self, query: Query, q: str) -> Tuple[Query, Optional[ColumnElement]]:
+        tsquery = func.websearch_to_tsquery(TS_CONFIG, q)
+        like = f"%{q}%"
+        # Each branch has its own GIN index, so the planner can BitmapOr them.
+        query = query.filter(
+            or_(_search_vector.op("@@")(tsquery), Task.title.ilike(like), Task.description.ilike(like))
+        )
+        return query, func.ts_rank(_search_vector, tsquery).desc()
+
+
+class SqliteFtsSearch:
+    name = "sqlite_fts"
+    # The trigram tokenizer cannot match strings shorter than one trigram.
+    min_length = 3
+
+    def apply(self, query: Query, q: str) -> Tuple[Query, Optional[ColumnElement]]:
+        if len(q) < self.min_length:
+            return LikeSearch().apply(query, q)
+        phrase = '"' + q.replace('"', '""') + '"'
+        query = query.join(_tasks_fts, _tasks_fts.c.rowid == Task.id).filter(_tasks_fts.c.tasks_fts.match(phrase))
+        # FTS5 ``rank`` is bm25(), where lower is better.
+        return query, _tasks_fts.c.rank.asc()
+
+
+_BACKENDS = {b.name: b for b in (LikeSearch(), PostgresSearch(), SqliteFtsSearch())}
+_detected: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+
+
+def _detect(bind: Engine | Connection) -> str:
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        probe = text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'tasks' AND column_name = 'search_vector'"
+        )
+        candidate = PostgresSearch.name
+    elif dialect == "sqlite":
+        probe = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'")
+        candidate = SqliteFtsSearch.name
+    else:
+        return LikeSearch.name
+    if isinstance(bind, Engine):
+        with bind.connect() as conn:
+            found = conn.execute(probe).first()
+    else:
+        found = bind.execute(probe).first()
+    return candidate if found else LikeSearch.name
+
+
+def _configured():
+    configured = settings.SEARCH_BACKEND.lower()
+    if configured == "auto":
+        return None
+    return _BACKENDS.get(configured, _BACKENDS[LikeSearch.name])
+
+
+def get_search_backend(db: Session):
+    """Backend for ``db`` per ``SEARCH_BACKEND`` ("auto" probes once per engine)."""
+    backend = _configured()
+    if backend is not None:
+        return backend
+    bind = db.get_bind()
+    engine = bind.engine if isinstance(bind, Connection) else bind
+    name = _detected.get(engine)
+    if name is None:
+        name = _detected[engine] = _detect(bind)
+    return _BACKENDS[name]
+
+
+async def get_search_backend_async(db: "AsyncSession"):
+    """``get_search_backend`` for the async stack; shares the per-engine probe cache."""
+    backend = _configured()
+    if backend is not None:
+        return backend
+    engine = db.bind.sync_engine
+    name = _detected.get(engine)
+    if name is None:
+        async with db.bind.connect() as conn:
+            name = _detected[engine] = await conn.run_sync(_detect)
+    return _BACKENDS[name]
+
+
+def install_sqlite_fts(engine: Engine) -> None:
+    """Create the FTS5 table and triggers on a SQLite database built via ``create_all``."""
+    with engine.begin() as conn:
+        for stmt in SQLITE_FTS_DDL:
+            conn.exec_driver_sql(stmt)
+    _detected.pop(engine, None)
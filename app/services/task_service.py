@@ -1,12 +1,29 @@
-from datetime import date
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import select, or_, func
+import base64
+import json
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from functools import partial
+from typing import Any, Callable, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Query, Session
+from sqlalchemy import bindparam, delete, insert, select, func, text, tuple_, update
+from sqlalchemy.sql.elements import ColumnElement
 from fastapi import HTTPException, status
 
 from app.models.task import Task, TaskStatus
 from app.models.user import User, UserRole
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import TaskBulkItemResult, TaskBulkUpdateItem, TaskCreate, TaskRead, TaskUpdate
+from app.services import task_cache, task_stats_service
+from app.services.task_search import get_search_backend
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.db.session import read_target
+
+
+class TaskPage(NamedTuple):
+    total: int | None
+    items: List[Task]
+    next_cursor: str | None
+    total_is_estimate: bool = False
 
 
 def create_task(db: Session, owner: User, task_in: TaskCreate) -> Task:
@@ -17,8 +34,10 @@ def create_task(db: Session, owner: User, task_in: TaskCreate) -> Task:
         due_date=task_in.due_date,
     )
     db.add(task)
+    task_stats_service.apply(db, Counter({(owner.id, TaskStatus.pending): 1}))
     db.commit()
     db.refresh(task)
+    task_cache.invalidate_owners([task.owner_id])
     return task
 
 
@@ -26,64 +45,513 @@ def get_task_by_id(db: Session, task_id: int) -> Task | None:
     return db.query(Task).filter(Task.id == task_id).first()
 
 
-def list_tasks(
-    db: Session,
+def get_task_version(db: Session, task_id: int):
+    """``(id, owner_id, updated_at)`` of a task: enough to authorize a conditional GET and build its ETag."""
+    return db.execute(select(Task.id, Task.owner_id, Task.updated_at).where(Task.id == task_id)).first()
+
+
+def _bad_request(detail: str) -> HTTPException:
+    # list_tasks shadows fastapi.status with its ``status`` filter argument.
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def encode_cursor(task: Task) -> str:
+    """Opaque keyset cursor pointing just past ``task`` in (created_at, id) DESC order."""
+    raw = json.dumps([task.created_at.isoformat(), task.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, TypeError):
+        raise _bad_request("Invalid cursor")
+
+
+def apply_task_filters(
+    query,
     *,
+    search=None,
     owner: User | None = None,
     all_tasks: bool = False,
     q: str | None = None,
     status: str | None = None,
     due_before: date | None = None,
     due_after: date | None = None,
-    limit: int = 20,
-    offset: int = 0,
-) -> Tuple[int, List[Task]]:
-    query = db.query(Task)
+):
+    """Narrow ``query`` (a ``Query[Task]`` or ``select(Task)``) by the listing
+    filters. Returns ``(query, rank)`` where ``rank`` is the search backend's
+    best-first ordering, or None."""
+    rank = None
 
     if not all_tasks and owner:
         query = query.filter(Task.owner_id == owner.id)
 
     if q:
-        like = f"%{q}%"
-        query = query.filter(or_(Task.title.ilike(like), Task.description.ilike(like)))
+        query, rank = search.apply(query, q)
 
     if status:
         try:
             status_enum = TaskStatus(status)
             query = query.filter(Task.status == status_enum)
         except ValueError:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
+            raise _bad_request("Invalid status")
 
     if due_before:
         query = query.filter(Task.due_date != None, Task.due_date <= due_before)  # noqa: E711
     if due_after:
         query = query.filter(Task.due_date != None, Task.due_date >= due_after)  # noqa: E711
+    return query, rank
+
+
+def filter_tasks_query(
+    db: Session,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+) -> Tuple[Query, ColumnElement | None]:
+    """Unordered ``Query[Task]`` for the listing filters, plus the search rank
+    expression (None unless ``q`` went through a ranking backend)."""
+    return apply_task_filters(
+        db.query(Task),
+        search=get_search_backend(db) if q else None,
+        owner=owner,
+        all_tasks=all_tasks,
+        q=q,
+        status=status,
+        due_before=due_before,
+        due_after=due_after,
+    )
 
-    total = query.count()
-    tasks = query.order_by(Task.created_at.desc()).offset(offset).limit(limit).all()
-    return total, tasks
 
+EXPORT_COLUMNS = ("id", "title", "description", "status", "due_date", "owner_id", "created_at", "updated_at")
 
-def update_task(db: Session, *, task: Task, task_in: TaskUpdate, current_user: User) -> Task:
+
+def iter_tasks(
+    db: Session,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+    batch_size: int = 1000,
+) -> Iterator[List[TaskRead]]:
+    """Stream every task matching the listing filters in batches, ordered by id.
+
+    Rows are plain column tuples read with ``yield_per`` (a server-side cursor on
+    Postgres), so memory use is bounded by ``batch_size`` however many rows match.
+    """
+    query, _ = filter_tasks_query(
+        db,
+        owner=owner,
+        all_tasks=all_tasks,
+        q=q,
+        status=status,
+        due_before=due_before,
+        due_after=due_after,
+    )
+    rows = query.with_entities(*(getattr(Task, c) for c in EXPORT_COLUMNS)).order_by(Task.id).yield_per(batch_size)
+    batch: List[TaskRead] = []
+    for row in rows:
+        batch.append(TaskRead.model_validate(row))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Identical concurrent listing reads share one database execution (TASK_READ_COALESCING)
+list_flights = SingleFlight()
+
+
+def flight_key(db, kind: str, owner: User | None, all_tasks: bool, params: tuple) -> tuple:
+    scope = None if all_tasks or owner is None else owner.id
+    # With the generation in the key, a read that starts after a write never joins one that started before it;
+    # with the read target, a reader pinned to the primary never gets a (lagging) replica's result.
+    return (kind, read_target(db), scope, task_cache.generation(scope), params)
+
+
+def detach_results(db, result):
+    """Expunge the tasks of a ``TaskPage`` from ``db`` so other requests can share them."""
+    if isinstance(result, TaskPage):
+        for task in result.items:
+            db.expunge(task)
+    return result
+
+
+def coalesced(db: Session, key: tuple, run: Callable[[], Any]) -> Any:
+    """``run()`` on ``db``, or the result of an identical call already running on another session."""
+    if not settings.TASK_READ_COALESCING:
+        return run()
+    return list_flights.do(key, lambda: detach_results(db, run()))
+
+
+def list_tasks(
+    db: Session,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str | None = None,
+    order_by_relevance: bool = False,
+    include_total: bool = True,
+    known_total: int | None = None,
+) -> TaskPage:
+    """Filtered page of tasks, newest first.
+
+    Pages by OFFSET by default; when ``cursor`` is given the offset is ignored and
+    the page starts right after the cursor's (created_at, id) position, so every
+    page costs the same as the first. ``next_cursor`` is None on the last page.
+
+    The total is skipped entirely with ``include_total=False``. Otherwise it is
+    ``known_total`` when the caller already counted (the count of
+    ``list_version``), or is counted here; for the unfiltered admin view of a
+    large Postgres table it is a cached planner estimate (``total_is_estimate``).
+
+    ``q`` goes through the configured search backend; with ``order_by_relevance``
+    matches are ranked best-first and paging is offset-only.
+
+    Identical concurrent calls share one execution (see ``coalesced``); the
+    returned tasks are then detached from ``db`` and must not be modified.
+    """
+    filters = dict(q=q, status=status, due_before=due_before, due_after=due_after)
+    page = dict(
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        order_by_relevance=order_by_relevance,
+        include_total=include_total,
+        known_total=known_total,
+    )
+    return coalesced(
+        db,
+        flight_key(db, "page", owner, all_tasks, tuple(filters.values()) + tuple(page.values())),
+        partial(_list_tasks, db, owner=owner, all_tasks=all_tasks, **filters, **page),
+    )
+
+
+def _list_tasks(
+    db: Session,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str | None = None,
+    order_by_relevance: bool = False,
+    include_total: bool = True,
+    known_total: int | None = None,
+) -> TaskPage:
+    if cursor and order_by_relevance:
+        raise _bad_request("Cursor pagination is not supported with relevance ordering")
+    seek = decode_cursor(cursor) if cursor else None
+    query, rank = filter_tasks_query(
+        db,
+        owner=owner,
+        all_tasks=all_tasks,
+        q=q,
+        status=status,
+        due_before=due_before,
+        due_after=due_after,
+    )
+
+    total, total_is_estimate = (known_total if include_total else None), False
+    if include_total and known_total is None:
+        scope = None if all_tasks or owner is None else owner.id
+        total, total_is_estimate = _count_tasks(db, query, scope, (q, status, due_before, due_after))
+    if seek:
+        query = query.filter(tuple_(Task.created_at, Task.id) < seek)
+        offset = 0
+    if order_by_relevance and rank is not None:
+        query = query.order_by(rank, Task.id.desc())
+    else:
+        order_by_relevance = False
+        query = query.order_by(Task.created_at.desc(), Task.id.desc())
+    # Fetch one extra row to learn whether a next page exists without another query.
+    rows = query.offset(offset).limit(limit + 1).all()
+    tasks = rows[:limit]
+    has_more = len(rows) > limit and tasks
+    next_cursor = encode_cursor(tasks[-1]) if has_more and not order_by_relevance else None
+    return TaskPage(total, tasks, next_cursor, total_is_estimate)
+
+
+LIST_VERSION_COLUMNS = (func.max(Task.updated_at), func.count(Task.id))
+
+
+def list_version(
+    db: Session,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+) -> Tuple[datetime | None, int] | None:
+    """``(max(updated_at), count)`` over the tasks matching the listing filters.
+
+    Every insert and update moves the maximum and every delete the count, so the
+    pair versions the listing for its ETag and its cached page. The count is exact;
+    pass it to ``list_tasks`` as ``known_total`` so the page's total does not cost a
+    second query; it also refreshes the count cache.
+
+    None when the listing has no cheap version: the unfiltered admin view that
+    avoids exact counts (see ``estimate_applies``) is not cached and its ETag is
+    a hash of the body.
+    """
+    filters = dict(q=q, status=status, due_before=due_before, due_after=due_after)
+    return coalesced(
+        db,
+        flight_key(db, "version", owner, all_tasks, tuple(filters.values())),
+        partial(_list_version, db, owner=owner, all_tasks=all_tasks, **filters),
+    )
+
+
+def _list_version(
+    db: Session,
+    *,
+    owner: User | None = None,
+    all_tasks: bool = False,
+    q: str | None = None,
+    status: str | None = None,
+    due_before: date | None = None,
+    due_after: date | None = None,
+) -> Tuple[datetime | None, int] | None:
+    scope = None if all_tasks or owner is None else owner.id
+    filters = (q, status, due_before, due_after)
+    if estimate_applies(db.get_bind().dialect.name, scope, filters):
+        return None
+    key = task_cache.count_key(scope, filters, read_target(db))
+    query, _ = filter_tasks_query(
+        db, owner=owner, all_tasks=all_tasks, q=q, status=status, due_before=due_before, due_after=due_after
+    )
+    version = tuple(query.with_entities(*LIST_VERSION_COLUMNS).one())
+    # The exact count came for free; later requests without a version reuse it
+    task_cache.counts.set(key, (version[1], False))
+    return version
+
+
+ESTIMATE_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'tasks'::regclass")
+
+
+def estimate_applies(dialect_name: str, owner_id: int | None, filters: tuple) -> bool:
+    """Only the unfiltered admin view of a Postgres table may use the planner estimate."""
+    return (
+        owner_id is None
+        and not any(filters)
+        and dialect_name == "postgresql"
+        and settings.TASK_COUNT_ESTIMATE_MIN_ROWS > 0
+    )
+
+
+def usable_estimate(estimate: int | None) -> int | None:
+    # reltuples is -1 until the table has been vacuumed/analyzed
+    if estimate is None or estimate < settings.TASK_COUNT_ESTIMATE_MIN_ROWS:
+        return None
+    return int(estimate)
+
+
+def _count_tasks(db: Session, query: Query, owner_id: int | None, filters: tuple) -> Tuple[int, bool]:
+    # Key is taken before counting so a concurrent write files the result under a stale generation.
+    key = task_cache.count_key(owner_id, filters, read_target(db))
+    cached = task_cache.counts.get(key)
+    if cached is not None:
+        return cached
+    result = None
+    if estimate_applies(db.get_bind().dialect.name, owner_id, filters):
+        estimate = usable_estimate(db.execute(ESTIMATE_SQL).scalar())
+        result = None if estimate is None else (estimate, True)
+    if result is None:
+        result = (query.count(), False)
+    task_cache.counts.set(key, result)
+    return result
+
+
+def ensure_task_access(task: Task, current_user: User) -> None:
     if current_user.role != UserRole.admin and task.owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-    for field, value in task_in.model_dump(exclude_unset=True).items():
-        if field == "status" and value is not None:
-            try:
-                value = TaskStatus(value)
-            except ValueError:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
+
+NOT_NULL_UPDATE_FIELDS = ("title", "status")
+
+
+def task_update_values(task_in: TaskUpdate) -> dict:
+    """Fields set on ``task_in`` with ``status`` converted to ``TaskStatus``."""
+    values = task_in.model_dump(exclude_unset=True)
+    for field in NOT_NULL_UPDATE_FIELDS:
+        if field in values and values[field] is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{field} cannot be null")
+    if values.get("status") is not None:
+        try:
+            values["status"] = TaskStatus(values["status"])
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status")
+    return values
+
+
+def update_task(db: Session, *, task: Task, task_in: TaskUpdate, current_user: User) -> Task:
+    ensure_task_access(task, current_user)
+
+    values = task_update_values(task_in)
+    if values.get("status") is not None:
+        previous = db.scalar(task_stats_service.locked_status_query(task.id))
+        task_stats_service.apply(db, task_stats_service.status_change(task.owner_id, previous, values["status"]))
+    for field, value in values.items():
         setattr(task, field, value)
 
     db.add(task)
     db.commit()
     db.refresh(task)
+    task_cache.invalidate_owners([task.owner_id])
     return task
 
 
 def delete_task(db: Session, *, task: Task, current_user: User) -> None:
-    if current_user.role != UserRole.admin and task.owner_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    ensure_task_access(task, current_user)
+    previous = db.scalar(task_stats_service.locked_status_query(task.id))
     db.delete(task)
+    task_stats_service.apply(db, task_stats_service.status_change(task.owner_id, previous, None))
+    db.commit()
+    task_cache.invalidate_owners([task.owner_id])
+
+
+def _bulk_access(db: Session, ids: List[int], current_user: User) -> Tuple[set, List[Tuple[str, str] | None]]:
+    """One SELECT for every id in the batch; returns the ids the user may modify
+    and, per position, a ``(status, detail)`` rejection or None."""
+    owners = dict(db.execute(select(Task.id, Task.owner_id).where(Task.id.in_(set(ids)))).all())
+    is_admin = current_user.role == UserRole.admin
+    allowed, rejections, seen = set(), [], set()
+    for task_id in ids:
+        if task_id in seen:
+            rejections.append(("invalid", "Duplicate task id in batch"))
+        elif task_id not in owners:
+            rejections.append(("not_found", "Task not found"))
+        elif not is_admin and owners[task_id] != current_user.id:
+            rejections.append(("forbidden", "Not authorized"))
+        else:
+            allowed.add(task_id)
+            rejections.append(None)
+        seen.add(task_id)
+    return allowed, rejections
+
+
+def bulk_create_tasks(db: Session, owner: User, items: List[TaskCreate]) -> List[TaskBulkItemResult]:
+    """Insert the whole batch with a single executemany INSERT .. RETURNING."""
+    rows = [
+        {"owner_id": owner.id, "title": item.title, "description": item.description, "due_date": item.due_date}
+        for item in items
+    ]
+    # Rows are still batched into multi-row VALUES; sort_by_parameter_order makes
+    # SQLAlchemy return them in input order, so each result keeps its item's index.
+    tasks = db.scalars(insert(Task).returning(Task, sort_by_parameter_order=True), rows).all()
+    task_stats_service.apply(db, Counter({(owner.id, TaskStatus.pending): len(tasks)}))
+    # Serialize before commit() expires the instances (which would reload each row).
+    results = [
+        TaskBulkItemResult(index=i, id=t.id, status="created", task=TaskRead.model_validate(t))
+        for i, t in enumerate(tasks)
+    ]
+    db.commit()
+    task_cache.invalidate_owners([owner.id])
+    return results
+
+
+def bulk_update_tasks(db: Session, *, items: List[TaskBulkUpdateItem], current_user: User) -> List[TaskBulkItemResult]:
+    """Apply per-item partial updates in one transaction.
+
+    Ownership is checked per item; the permitted rows are written with one
+    executemany UPDATE per set of changed columns and read back with one SELECT.
+    """
+    allowed, rejections = _bulk_access(db, [item.id for item in items], current_user)
+    results: List[TaskBulkItemResult | None] = []
+    params = []
+    for index, (item, rejection) in enumerate(zip(items, rejections)):
+        if rejection:
+            results.append(TaskBulkItemResult(index=index, id=item.id, status=rejection[0], detail=rejection[1]))
+            continue
+        try:
+            values = task_update_values(item)
+        except HTTPException as e:
+            allowed.discard(item.id)
+            results.append(TaskBulkItemResult(index=index, id=item.id, status="invalid", detail=e.detail))
+            continue
+        values.pop("id")
+        if values:
+            params.append({"task_id": item.id, **values})
+        results.append(None)
+
+    if params:
+        status_updates = {p["task_id"]: p["status"] for p in params if p.get("status") is not None}
+        if status_updates:
+            previous = db.execute(
+                select(Task.id, Task.owner_id, Task.status).where(Task.id.in_(status_updates)).with_for_update()
+            ).all()
+            deltas = Counter()
+            for task_id, owner_id, status_before in previous:
+                deltas.update(task_stats_service.status_change(owner_id, status_before, status_updates[task_id]))
+            task_stats_service.apply(db, deltas)
+        # Core rather than the ORM's bulk UPDATE by primary key: a row deleted since the access
+        # check matches nothing here (and is reported not_found below) instead of raising
+        # StaleDataError for the whole batch. An executemany needs the same columns in every row.
+        table = Task.__table__
+        by_columns = defaultdict(list)
+        for row in params:
+            by_columns[frozenset(row)].append(row)
+        for rows in by_columns.values():
+            db.execute(update(table).where(table.c.id == bindparam("task_id")), rows)
+    updated = {t.id: t for t in db.scalars(select(Task).where(Task.id.in_(allowed)))} if allowed else {}
+    owners = set()
+    for index, item in enumerate(items):
+        if results[index] is not None:
+            continue
+        task = updated.get(item.id)
+        if task is None:  # deleted concurrently
+            results[index] = TaskBulkItemResult(index=index, id=item.id, status="not_found", detail="Task not found")
+            continue
+        owners.add(task.owner_id)
+        results[index] = TaskBulkItemResult(index=index, id=task.id, status="updated", task=TaskRead.model_validate(task))
+    db.commit()
+    task_cache.invalidate_owners(owners)
+    return results
+
+
+def bulk_delete_tasks(db: Session, *, ids: List[int], current_user: User) -> List[TaskBulkItemResult]:
+    """Delete the permitted ids with a single DELETE .. RETURNING."""
+    allowed, rejections = _bulk_access(db, ids, current_user)
+    deleted = {}
+    if allowed:
+        stmt = delete(Task).where(Task.id.in_(allowed)).returning(Task.id, Task.owner_id, Task.status)
+        rows = db.execute(stmt, execution_options={"synchronize_session": False}).all()
+        deleted = {task_id: owner_id for task_id, owner_id, _ in rows}
+        deltas = Counter()
+        for _, owner_id, status_before in rows:
+            deltas[(owner_id, status_before)] -= 1
+        task_stats_service.apply(db, deltas)
     db.commit()
+    task_cache.invalidate_owners(deleted.values())
+    results = []
+    for index, (task_id, rejection) in enumerate(zip(ids, rejections)):
+        if rejection:
+            results.append(TaskBulkItemResult(index=index, id=task_id, status=rejection[0], detail=rejection[1]))
+        elif task_id in deleted:
+            results.append(TaskBulkItemResult(index=index, id=task_id, status="deleted"))
+        else:
+            results.append(TaskBulkItemResult(index=index, id=task_id, status="not_found", detail="Task not found"))
+    return results
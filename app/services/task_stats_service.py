@@ -0,0 +1,142 @@
+"""Per-owner task counters (``task_stats``) behind ``GET /tasks/stats``.
+
+Task writers describe their effect as a ``Counter`` of ``(owner_id, status)``
+deltas and pass it to ``apply`` before committing, so the counters change in
+the same transaction as the tasks and reading them is a primary-key lookup.
+Status changes read the previous status with ``SELECT .. FOR UPDATE`` so
+concurrent updates of one task cannot double-count.
+
+Overdue depends on today's date, so it is not stored: it is counted over the
+partial ``due_date`` indexes, which only hold tasks that have a due date.
+
+``reconcile`` compares the counters with ``tasks`` and rewrites drifted rows
+(``python -m seeds.rebuild_task_stats``).
+"""
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskStatus
+from app.models.task_stats import TaskStats
+from app.schemas.task import TaskStatsRead
+
+STATUS_COLUMNS = tuple(s.value for s in TaskStatus)
+_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def _rows(deltas: Counter) -> List[dict]:
+    by_owner: Dict[int, dict] = {}
+    for (owner_id, status), change in deltas.items():
+        if change:
+            by_owner.setdefault(owner_id, dict.fromkeys(STATUS_COLUMNS, 0))[TaskStatus(status).value] += change
+    # Owner order keeps the row-lock order the same in every transaction
+    return [{"owner_id": owner_id, **counts} for owner_id, counts in sorted(by_owner.items())]
+
+
+def _upsert(dialect_name: str, increment: bool):
+    stmt = _INSERTS[dialect_name](TaskStats)
+    if increment:
+        values = {c: getattr(TaskStats, c) + getattr(stmt.excluded, c) for c in STATUS_COLUMNS}
+    else:
+        values = {c: getattr(stmt.excluded, c) for c in STATUS_COLUMNS}
+    return stmt.on_conflict_do_update(index_elements=[TaskStats.owner_id], set_=values)
+
+
+def apply(db: Session, deltas: Counter) -> None:
+    """Add ``{(owner_id, status): change}`` to the counters; the caller commits."""
+    rows = _rows(deltas)
+    if rows:
+        db.execute(_upsert(db.get_bind().dialect.name, increment=True), rows)
+
+
+async def apply_async(db, deltas: Counter) -> None:
+    rows = _rows(deltas)
+    if rows:
+        await db.execute(_upsert(db.bind.dialect.name, increment=True), rows)
+
+
+def status_change(owner_id: int, previous: TaskStatus | None, current: TaskStatus | None) -> Counter:
+    deltas = Counter()
+    if previous != current:
+        if previous is not None:
+            deltas[(owner_id, previous)] -= 1
+        if current is not None:
+            deltas[(owner_id, current)] += 1
+    return deltas
+
+
+def locked_status_query(task_id: int):
+    """Current status of a task, row-locked until commit (a no-op lock on SQLite)."""
+    return select(Task.status).where(Task.id == task_id).with_for_update()
+
+
+def forget_owner(db: Session, owner_id: int) -> None:
+    # ON DELETE CASCADE covers this where foreign keys are enforced; SQLite does not by default
+    db.execute(delete(TaskStats).where(TaskStats.owner_id == owner_id))
+
+
+def _overdue_query(owner_id: int | None, today: date):
+    query = select(func.count()).select_from(Task).where(
+        Task.due_date != None, Task.due_date < today, Task.status != TaskStatus.done  # noqa: E711
+    )
+    return query.where(Task.owner_id == owner_id) if owner_id is not None else query
+
+
+def get_stats(db: Session, owner_id: int | None) -> TaskStatsRead:
+    """Counters of one owner, or summed over all owners when ``owner_id`` is None."""
+    if owner_id is None:
+        row = db.execute(select(*(func.coalesce(func.sum(getattr(TaskStats, c)), 0) for c in STATUS_COLUMNS))).one()
+    else:
+        row = db.execute(
+            select(*(getattr(TaskStats, c) for c in STATUS_COLUMNS)).where(TaskStats.owner_id == owner_id)
+        ).first() or (0,) * len(STATUS_COLUMNS)
+    counts = dict(zip(STATUS_COLUMNS, (int(v) for v in row)))
+    overdue = db.scalar(_overdue_query(owner_id, date.today()))
+    return TaskStatsRead(**counts, total=sum(counts.values()), overdue=overdue)
+
+
+def _actual_counts(db: Session, owner_ids: Iterable[int] | None) -> Dict[int, dict]:
+    query = select(
+        Task.owner_id, *(func.sum(case((Task.status == TaskStatus(c), 1), else_=0)) for c in STATUS_COLUMNS)
+    ).group_by(Task.owner_id)
+    if owner_ids is not None:
+        query = query.where(Task.owner_id.in_(list(owner_ids)))
+    return {owner_id: dict(zip(STATUS_COLUMNS, map(int, counts))) for owner_id, *counts in db.execute(query)}
+
+
+def _stored_counts(db: Session, owner_ids: Iterable[int] | None) -> Dict[int, dict]:
+    query = select(TaskStats.owner_id, *(getattr(TaskStats, c) for c in STATUS_COLUMNS))
+    if owner_ids is not None:
+        query = query.where(TaskStats.owner_id.in_(list(owner_ids)))
+    return {owner_id: dict(zip(STATUS_COLUMNS, counts)) for owner_id, *counts in db.execute(query)}
+
+
+def reconcile(db: Session, owner_ids: Iterable[int] | None = None, *, fix: bool = True) -> Dict[int, Tuple[dict, dict]]:
+    """Compare the counters with ``tasks`` (for ``owner_ids``, or everyone).
+
+    Returns ``{owner_id: (stored, actual)}`` for every owner that drifted and,
+    with ``fix``, overwrites those rows; the caller commits. On Postgres task
+    writes are blocked (``SHARE`` lock on ``tasks``) until then, so no write
+    can slip between the recount and the rewrite.
+    """
+    owner_ids = None if owner_ids is None else set(owner_ids)
+    dialect = db.get_bind().dialect.name
+    if fix and dialect == "postgresql":
+        db.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+    actual = _actual_counts(db, owner_ids)
+    stored = _stored_counts(db, owner_ids)
+    zero = dict.fromkeys(STATUS_COLUMNS, 0)
+    drifted = {
+        owner_id: (stored.get(owner_id, zero), actual.get(owner_id, zero))
+        for owner_id in set(actual) | set(stored)
+        if stored.get(owner_id, zero) != actual.get(owner_id, zero)
+    }
+    if fix and drifted:
+        rows = [{"owner_id": owner_id, **counts} for owner_id, (_, counts) in sorted(drifted.items())]
+        db.execute(_upsert(dialect, increment=False), rows)
+    return drifted
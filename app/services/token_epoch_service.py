@@ -0,0 +1,93 @@
+"""Stateless access tokens (AUTH_STATELESS) and their revocation epochs.
+
+In stateless mode the token carries ``uid``, ``role`` and ``token_epoch`` next
+to ``sub``, so ``get_current_user`` can authorize without loading the user row.
+Revocation goes through ``user_token_epochs``: an admin changing a user's role,
+password or email, or deleting the user, bumps the epoch and every token issued
+with an older one is rejected. Epochs are cached per process for
+AUTH_EPOCH_CACHE_TTL_SECONDS; the worker that made the change forgets its entry
+immediately, other workers pick the new epoch up within the TTL.
+"""
+from typing import Any, Dict
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.token_epoch import UserTokenEpoch
+from app.models.user import User, UserRole
+
+_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+epochs = TTLCache(maxsize=settings.AUTH_EPOCH_CACHE_SIZE, ttl=settings.AUTH_EPOCH_CACHE_TTL_SECONDS)
+
+
+def _epoch_query(user_id: int):
+    return select(UserTokenEpoch.epoch).where(UserTokenEpoch.user_id == user_id)
+
+
+def get_epoch(db: Session, user_id: int) -> int:
+    epoch = epochs.get(user_id)
+    if epoch is None:
+        epoch = db.scalar(_epoch_query(user_id)) or 0
+        epochs.set(user_id, epoch)
+    return epoch
+
+
+async def get_epoch_async(db, user_id: int) -> int:
+    epoch = epochs.get(user_id)
+    if epoch is None:
+        epoch = await db.scalar(_epoch_query(user_id)) or 0
+        epochs.set(user_id, epoch)
+    return epoch
+
+
+def bump_epoch(db: Session, user_id: int) -> None:
+    """Revoke the user's outstanding tokens; the caller commits, then calls ``forget``."""
+    # One upsert, so two concurrent first bumps cannot both try to insert the row
+    stmt = _INSERTS[db.get_bind().dialect.name](UserTokenEpoch).values(user_id=user_id, epoch=1)
+    db.execute(
+        stmt.on_conflict_do_update(index_elements=[UserTokenEpoch.user_id], set_={"epoch": UserTokenEpoch.epoch + 1})
+    )
+
+
+def forget(user_id: int) -> None:
+    epochs.pop(user_id)
+
+
+def token_claims(user: User, epoch: int) -> Dict[str, Any]:
+    if not settings.AUTH_STATELESS:
+        return {"sub": user.email}
+    return {"sub": user.email, "uid": user.id, "role": user.role.value, "token_epoch": epoch}
+
+
+def issue_access_token(db: Session, user: User) -> str:
+    epoch = get_epoch(db, user.id) if settings.AUTH_STATELESS else 0
+    return create_access_token(token_claims(user, epoch))
+
+
+async def issue_access_token_async(db, user: User) -> str:
+    epoch = await get_epoch_async(db, user.id) if settings.AUTH_STATELESS else 0
+    return create_access_token(token_claims(user, epoch))
+
+
+def is_stateless(payload: Dict[str, Any]) -> bool:
+    """Whether to authorize from the claims alone (older tokens without them use the DB path)."""
+    return settings.AUTH_STATELESS and "uid" in payload and "token_epoch" in payload
+
+
+def principal_from_claims(payload: Dict[str, Any], current_epoch: int) -> User:
+    """A detached ``User`` built from verified claims; only id, email and role are loaded."""
+    if payload["token_epoch"] != current_epoch:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    try:
+        user = User(id=int(payload["uid"]), email=payload["sub"], role=UserRole(payload.get("role")))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    make_transient_to_detached(user)
+    return user
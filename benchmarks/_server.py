@@ -0,0 +1,129 @@
+"""Shared helpers for the HTTP benchmarks: run the API under uvicorn in a
+subprocess with a given environment and drive it with concurrent httpx clients.
+
+Without DATABASE_URL in the environment a throwaway SQLite file is used, so the
+benchmarks run without a database server (numbers are then only comparable to
+each other, not to production).
+"""
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def default_database_url() -> str:
+    return os.environ.get("DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+
+def prepare_database(url: str) -> None:
+    """Create the schema on a fresh SQLite file (Postgres is expected to be migrated)."""
+    if not url.startswith("sqlite"):
+        return
+    from sqlalchemy import create_engine
+
+    sys.path.insert(0, str(ROOT))
+    from app.db import base  # noqa: F401
+    from app.models.user import Base
+    from app.services.task_search import install_sqlite_fts
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    install_sqlite_fts(engine)
+    engine.dispose()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def running_server(env: Dict[str, str], workers: int = 1) -> Iterator[str]:
+    port = _free_port()
+    proc_env = {**os.environ, "LOG_LEVEL": "warning", **env}
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=proc_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(base_url + "/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if proc.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"server did not start: {' '.join(cmd)}")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+async def auth_headers(client: httpx.AsyncClient, email: str, password: str = "password123") -> Dict[str, str]:
+    await client.post("/auth/register", json={"email": email, "password": password})
+    resp = await client.post("/auth/login", data={"username": email, "password": password})
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+async def seed_tasks(client: httpx.AsyncClient, headers: Dict[str, str], count: int) -> None:
+    items = [{"title": f"Bench task {i}", "description": "x" * 80} for i in range(count)]
+    for start in range(0, count, 500):
+        resp = await client.post("/tasks/bulk", json={"items": items[start:start + 500]}, headers=headers)
+        resp.raise_for_status()
+
+
+async def hammer(
+    client: httpx.AsyncClient,
+    path: str,
+    *,
+    headers: Dict[str, str] | None = None,
+    requests: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    """Issue ``requests`` GETs with ``concurrency`` in flight; returns throughput and latency percentiles."""
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            resp = await client.get(path, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if resp.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "errors": errors,
+    }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    print(f"{'':<28}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, r in rows.items():
+        print(f"{name:<28}{r['rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['errors']:>8}")
@@ -0,0 +1,56 @@
+"""Compare the sync (threadpool) and async database stacks under concurrent load.
+
+Starts the API once per DB_STACK value and measures GET /tasks/ and
+GET /tasks/{id} throughput/latency at the given concurrency.
+
+    python -m benchmarks.bench_db_stack --requests 2000 --concurrency 64
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.bench_db_stack
+"""
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks._server import (
+    auth_headers,
+    default_database_url,
+    hammer,
+    prepare_database,
+    print_table,
+    running_server,
+    seed_tasks,
+)
+
+
+async def run_stack(base_url: str, requests: int, concurrency: int, tasks: int):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        headers = await auth_headers(client, "bench-stack@example.com")
+        first = (await client.get("/tasks/?limit=1", headers=headers)).json()
+        if first["total"] < tasks:
+            await seed_tasks(client, headers, tasks - first["total"])
+        task_id = (await client.get("/tasks/?limit=1", headers=headers)).json()["items"][0]["id"]
+        return {
+            "GET /tasks/?limit=20": await hammer(client, "/tasks/?limit=20", headers=headers, requests=requests, concurrency=concurrency),
+            "GET /tasks/{id}": await hammer(client, f"/tasks/{task_id}", headers=headers, requests=requests, concurrency=concurrency),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--tasks", type=int, default=500, help="tasks seeded for the benchmark user")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    args = parser.parse_args()
+
+    url = default_database_url()
+    prepare_database(url)
+    for stack in ("sync", "async"):
+        with running_server({"DATABASE_URL": url, "DB_STACK": stack}, workers=args.workers) as base_url:
+            rows = asyncio.run(run_stack(base_url, args.requests, args.concurrency, args.tasks))
+        print_table(f"DB_STACK={stack} (concurrency {args.concurrency}, {args.requests} requests)", rows)
+
+
+if __name__ == "__main__":
+    main()
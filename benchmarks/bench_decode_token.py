@@ -0,0 +1,43 @@
+"""Microbenchmark of ``decode_token`` with the verified-token cache on and off.
+
+    python -m benchmarks.bench_decode_token --iterations 50000 --tokens 100
+
+``--tokens`` distinct tokens are decoded round-robin, as if that many clients
+were each re-sending their token.
+"""
+import argparse
+import time
+
+from app.core import security
+from app.core.cache import TTLCache
+
+
+def run(tokens, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        security.decode_token(tokens[i % len(tokens)])
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+
+    tokens = [security.create_access_token({"sub": f"user{i}@example.com"}) for i in range(args.tokens)]
+    enabled = security.verified_tokens
+    results = {}
+    security.verified_tokens = TTLCache(maxsize=0, ttl=0)
+    results["cache off"] = run(tokens, args.iterations)
+    security.verified_tokens = enabled
+    results["cache on"] = run(tokens, args.iterations)
+
+    print(f"\ndecode_token, {args.iterations} calls over {args.tokens} tokens")
+    for name, rate in results.items():
+        print(f"{name:<12}{rate:>14,.0f} decodes/s{1e6 / rate:>10.2f} us/decode")
+    print(f"speedup     {results['cache on'] / results['cache off']:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Task endpoint latency during a login storm.
+
+Measures GET /tasks/ alone, then again while --logins concurrent logins hammer
+/auth/login. With the bounded bcrypt pool the task numbers should barely move;
+logins beyond PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE get 503.
+
+    python -m benchmarks.bench_login_storm --requests 1000 --login-concurrency 64
+    PASSWORD_HASH_MAX_QUEUE=1000 python -m benchmarks.bench_login_storm   # effectively unbounded
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from benchmarks._server import (
+    auth_headers,
+    default_database_url,
+    hammer,
+    prepare_database,
+    print_table,
+    running_server,
+    seed_tasks,
+)
+
+
+async def login_storm(client: httpx.AsyncClient, email: str, logins: int, concurrency: int):
+    latencies, codes = [], {}
+    remaining = iter(range(logins))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            resp = await client.post("/auth/login", data={"username": email, "password": "password123"})
+            latencies.append((time.perf_counter() - start) * 1000)
+            codes[resp.status_code] = codes.get(resp.status_code, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, codes
+
+
+async def run(base_url: str, args):
+    limits = httpx.Limits(max_connections=args.concurrency + args.login_concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        headers = await auth_headers(client, "bench-storm@example.com")
+        await seed_tasks(client, headers, 100)
+        path = "/tasks/?limit=20&include_total=false"
+        rows = {"GET /tasks/ (idle)": await hammer(client, path, headers=headers, requests=args.requests, concurrency=args.concurrency)}
+        storm = asyncio.create_task(login_storm(client, "bench-storm@example.com", args.logins, args.login_concurrency))
+        await asyncio.sleep(0.2)  # let the storm build up
+        rows["GET /tasks/ (login storm)"] = await hammer(client, path, headers=headers, requests=args.requests, concurrency=args.concurrency)
+        latencies, codes = await storm
+    return rows, latencies, codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent task readers")
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--login-concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    url = default_database_url()
+    prepare_database(url)
+    env = {"DATABASE_URL": url}
+    for name in ("PASSWORD_HASH_WORKERS", "PASSWORD_HASH_MAX_QUEUE"):
+        if name in os.environ:
+            env[name] = os.environ[name]
+    with running_server(env) as base_url:
+        rows, latencies, codes = asyncio.run(run(base_url, args))
+    print_table(f"Task reads, {args.concurrency} concurrent, during {args.logins} logins x {args.login_concurrency} concurrent", rows)
+    print(f"\nlogins: status counts {dict(sorted(codes.items()))}, p50 {statistics.median(latencies):.1f} ms, max {max(latencies):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Requests per second with the legacy BaseHTTPMiddleware stack vs the single ASGI middleware.
+
+Starts the API once per MIDDLEWARE_STACK value and measures /health and
+GET /tasks/ at the given concurrency.
+
+    python -m benchmarks.bench_middleware --requests 3000 --concurrency 32
+"""
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks._server import (
+    auth_headers,
+    default_database_url,
+    hammer,
+    prepare_database,
+    print_table,
+    running_server,
+    seed_tasks,
+)
+
+
+async def run_stack(base_url: str, requests: int, concurrency: int, seed: bool):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        headers = await auth_headers(client, "bench-middleware@example.com")
+        if seed:
+            await seed_tasks(client, headers, 100)
+        return {
+            "GET /health": await hammer(client, "/health", requests=requests, concurrency=concurrency),
+            "GET /tasks/?limit=20": await hammer(client, "/tasks/?limit=20", headers=headers, requests=requests, concurrency=concurrency),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    url = default_database_url()
+    prepare_database(url)
+    for i, stack in enumerate(("legacy", "asgi")):
+        with running_server({"DATABASE_URL": url, "MIDDLEWARE_STACK": stack}) as base_url:
+            rows = asyncio.run(run_stack(base_url, args.requests, args.concurrency, seed=i == 0))
+        print_table(f"MIDDLEWARE_STACK={stack} (concurrency {args.concurrency}, {args.requests} requests)", rows)
+
+
+if __name__ == "__main__":
+    main()
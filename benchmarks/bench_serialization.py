@@ -0,0 +1,102 @@
+"""Task list serialization: per-item ``TaskRead`` + ``response_model`` (before) vs single pass (after).
+
+Both routes are mounted on a bare FastAPI app and driven through ASGI directly
+(no sockets, no database), so the numbers isolate what the endpoint spends
+turning a page of ORM rows into response bytes.
+
+    python -m benchmarks.bench_serialization --iterations 300
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import FastAPI
+
+from app.api.responses import dump_task_page, json_response
+from app.models.task import Task, TaskStatus
+from app.schemas.task import PaginatedTasks, TaskRead
+from app.services.task_service import TaskPage
+
+PAGE_SIZES = (20, 100, 1000)
+
+
+def _tasks(n: int):
+    now = datetime(2025, 9, 10, 4, 59, 54, tzinfo=timezone.utc)
+    statuses = list(TaskStatus)
+    return [
+        Task(
+            id=i, owner_id=1 + i % 7, title=f"Task {i}", description="lorem ipsum " * 8,
+            status=statuses[i % len(statuses)], due_date=date(2025, 10, 1) + timedelta(days=i % 30),
+            created_at=now, updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+
+def _app(pages) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before/{n}", response_model=PaginatedTasks)
+    def before(n: int):
+        page = pages[n]
+        return PaginatedTasks(
+            total=page.total,
+            total_is_estimate=page.total_is_estimate,
+            items=[TaskRead.model_validate(t) for t in page.items],
+            next_cursor=page.next_cursor,
+        )
+
+    @app.get("/after/{n}", response_model=PaginatedTasks)
+    def after(n: int):
+        return json_response(dump_task_page(pages[n]))
+
+    return app
+
+
+async def _call(app: FastAPI, path: str) -> bytes:
+    scope = {"type": "http", "http_version": "1.1", "method": "GET", "path": path, "raw_path": path.encode(),
+             "query_string": b"", "headers": [], "scheme": "http", "server": ("bench", 80), "client": ("bench", 1)}
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def _run(app: FastAPI, iterations: int):
+    results = {}
+    for n in PAGE_SIZES:
+        # Fewer rounds for big pages keeps the run short without changing per-request cost
+        rounds = max(10, iterations * 20 // n)
+        assert await _call(app, f"/before/{n}") == await _call(app, f"/after/{n}")
+        for variant in ("before", "after"):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                await _call(app, f"/{variant}/{n}")
+            results[(n, variant)] = (time.perf_counter() - start) / rounds * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300, help="requests per variant at page size 20")
+    args = parser.parse_args()
+
+    pages = {n: TaskPage(total=n * 10, items=_tasks(n), next_cursor="opaque-cursor") for n in PAGE_SIZES}
+    results = asyncio.run(_run(_app(pages), args.iterations))
+
+    print(f"\n{'page size':<12}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for n in PAGE_SIZES:
+        before, after = results[(n, "before")], results[(n, "after")]
+        print(f"{n:<12}{before:>12.3f}{after:>12.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
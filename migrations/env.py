@@ -23,6 +23,23 @@ if config.config_file_name is not None:
 # Target metadata for 'autogenerate'
 target_metadata = Base.metadata
 
+# Search structures managed by raw-SQL migrations rather than the ORM models
+# (see app/services/task_search.py); autogenerate must not try to drop them.
+UNMANAGED_NAMES = {
+    "search_vector",
+    "ix_tasks_search_vector",
+    "ix_tasks_title_trgm",
+    "ix_tasks_description_trgm",
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if name in UNMANAGED_NAMES:
+        return False
+    if type_ == "table" and name and name.startswith("tasks_fts"):
+        return False
+    return True
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -43,6 +60,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -67,6 +85,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
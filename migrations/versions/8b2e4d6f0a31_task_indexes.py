@@ -0,0 +1,69 @@
+"""task indexes
+
+Revision ID: 8b2e4d6f0a31
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-17 11:40:05.527114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6f0a31'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, columns, partial predicate) -- mirrors Task.__table_args__
+INDEXES = [
+    ('ix_tasks_owner_created', ['owner_id', 'created_at', 'id'], None),
+    ('ix_tasks_owner_status_created', ['owner_id', 'status', 'created_at', 'id'], None),
+    ('ix_tasks_owner_due', ['owner_id', 'due_date'], 'due_date IS NOT NULL'),
+    ('ix_tasks_created', ['created_at', 'id'], None),
+    ('ix_tasks_status_created', ['status', 'created_at', 'id'], None),
+    ('ix_tasks_due', ['due_date'], 'due_date IS NOT NULL'),
+]
+
+# ix_tasks_id duplicates the primary key; ix_tasks_owner_id is a prefix of
+# ix_tasks_owner_created (which also serves the owner_id foreign key).
+REDUNDANT = [
+    ('ix_tasks_id', ['id']),
+    ('ix_tasks_owner_id', ['owner_id']),
+]
+
+
+def _concurrently() -> dict:
+    return {'postgresql_concurrently': True} if op.get_bind().dialect.name == 'postgresql' else {}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            partial = sa.text(where) if where else None
+            op.create_index(
+                name,
+                'tasks',
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_where=partial,
+                sqlite_where=partial,
+                **_concurrently(),
+            )
+        for name, _ in REDUNDANT:
+            op.drop_index(name, table_name='tasks', if_exists=True, **_concurrently())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in REDUNDANT:
+            op.create_index(name, 'tasks', columns, unique=False, if_not_exists=True, **_concurrently())
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='tasks', if_exists=True, **_concurrently())
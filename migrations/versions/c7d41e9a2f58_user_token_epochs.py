@@ -0,0 +1,32 @@
+"""user token epochs
+
+Revision ID: c7d41e9a2f58
+Revises: 8b2e4d6f0a31
+Create Date: 2026-10-17 14:05:12.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d41e9a2f58'
+down_revision: Union[str, Sequence[str], None] = '8b2e4d6f0a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_token_epochs',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('epoch', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_token_epochs')
@@ -0,0 +1,37 @@
+"""task updated index
+
+Revision ID: e4a9b2c61d07
+Revises: c7d41e9a2f58
+Create Date: 2026-10-17 16:22:41.904317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9b2c61d07'
+down_revision: Union[str, Sequence[str], None] = 'c7d41e9a2f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _concurrently() -> dict:
+    return {'postgresql_concurrently': True} if op.get_bind().dialect.name == 'postgresql' else {}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the list ETag aggregate (max(updated_at), count) for one owner as an index-only scan.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_owner_updated', 'tasks', ['owner_id', 'updated_at'],
+            unique=False, if_not_exists=True, **_concurrently(),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_owner_updated', table_name='tasks', if_exists=True, **_concurrently())
@@ -0,0 +1,44 @@
+"""task stats
+
+Revision ID: f2c8d5a3b914
+Revises: e4a9b2c61d07
+Create Date: 2026-10-17 17:48:09.615230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8d5a3b914'
+down_revision: Union[str, Sequence[str], None] = 'e4a9b2c61d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_stats',
+    sa.Column('owner_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('pending', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('in_progress', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('done', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    # Backfill from the existing rows (same statement as task_stats_service.rebuild)
+    op.execute(
+        "INSERT INTO task_stats (owner_id, pending, in_progress, done) "
+        "SELECT owner_id, "
+        "SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN status = 'in_progress' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN status = 'done' THEN 1 ELSE 0 END) "
+        "FROM tasks GROUP BY owner_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_stats')
@@ -0,0 +1,69 @@
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services import import_service
+from app.core.config import settings
+import argparse
+import sys
+
+"""Bulk-load tasks for one user from a CSV or NDJSON file (or stdin).
+
+The file is streamed: rows are validated and written chunk by chunk (COPY on
+Postgres), with progress printed after every committed chunk.
+
+Usage examples inside container:
+  python -m seeds.import_tasks --user-email alice@example.com --file tasks.csv
+  zcat tasks.ndjson.gz | python -m seeds.import_tasks --user-email alice@example.com --file - --format ndjson
+
+CSV columns: title, description, due_date (YYYY-MM-DD). NDJSON: one object per line with the same keys.
+"""
+
+
+def import_file(email: str, path: str, fmt: str | None, chunk_size: int) -> int:
+    fmt = fmt or import_service.detect_format(path)
+    if fmt is None:
+        print("Cannot infer the format from the file name; pass --format csv|ndjson")
+        return 2
+    db = SessionLocal()
+    stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            print(f"User {email} not found. Create the user first (e.g., via /auth/register).")
+            return 1
+
+        def progress(result):
+            print(f"  rows read: {result.rows_read}  imported: {result.imported}  failed: {result.failed}", flush=True)
+
+        result = import_service.import_tasks(
+            db,
+            user.id,
+            stream,
+            fmt,
+            chunk_size=chunk_size,
+            max_errors=settings.TASK_IMPORT_MAX_ERRORS,
+            on_progress=progress,
+        )
+        for err in result.errors:
+            print(f"  line {err.line}: {err.error}")
+        if result.errors_truncated:
+            print(f"  ... more errors not shown ({result.failed} failed rows in total)")
+        print(f"Done. Imported {result.imported} of {result.rows_read} rows for {email}.")
+        return 0 if result.failed == 0 else 1
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task import CLI")
+    parser.add_argument('--user-email', required=True, help='Owner of the imported tasks')
+    parser.add_argument('--file', required=True, help="CSV/NDJSON file to import, or '-' for stdin")
+    parser.add_argument('--format', choices=import_service.IMPORT_FORMATS, help='Defaults to the file extension')
+    parser.add_argument('--chunk-size', type=int, default=settings.TASK_IMPORT_CHUNK_SIZE, help='Rows per committed chunk')
+    args = parser.parse_args()
+    sys.exit(import_file(args.user_email, args.file, args.format, args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
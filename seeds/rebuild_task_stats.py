@@ -0,0 +1,41 @@
+from app.db.session import SessionLocal
+from app.services import task_stats_service
+import argparse
+import sys
+
+"""Recount the per-owner task counters (``task_stats``) from ``tasks``.
+
+Normally the counters are maintained by every task write; run this after
+loading tasks outside the API, or to check for drift.
+
+Usage examples inside container:
+  python -m seeds.rebuild_task_stats            # fix every drifted owner
+  python -m seeds.rebuild_task_stats --check    # report drift only; exit code 1 if any
+  python -m seeds.rebuild_task_stats --owner-id 4 --owner-id 7
+"""
+
+
+def rebuild(owner_ids: list[int] | None, check: bool) -> int:
+    db = SessionLocal()
+    try:
+        drifted = task_stats_service.reconcile(db, owner_ids, fix=not check)
+        db.commit()
+        for owner_id, (stored, actual) in sorted(drifted.items()):
+            print(f"  owner {owner_id}: stored {stored} actual {actual}")
+        verb = "Found" if check else "Rebuilt"
+        print(f"{verb} {len(drifted)} drifted owner(s).")
+        return 1 if check and drifted else 0
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task statistics reconciliation")
+    parser.add_argument('--owner-id', type=int, action='append', help='Limit to these owners (repeatable)')
+    parser.add_argument('--check', action='store_true', help='Report drift without rewriting the counters')
+    args = parser.parse_args()
+    sys.exit(rebuild(args.owner_id, args.check))
+
+
+if __name__ == "__main__":
+    main()
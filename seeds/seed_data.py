@@ -2,8 +2,14 @@ from app.db.session import SessionLocal
 from app.models.user import User, UserRole
 from app.models.task import Task, TaskStatus
 from app.core.security import get_password_hash
+from app.services import import_service, task_stats_service
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from sqlalchemy import insert, select
 import argparse
+import random
+import time
 
 """Seed script to insert initial users and tasks.
 Safe to run multiple times: it checks for existing seed users by email.
@@ -16,6 +22,9 @@ Usage examples inside container:
   # Add (or ensure) 15 tasks exist for a user
   python seeds/seed_data.py --user-email ali@emumba.com --tasks 15
 
+  # Synthetic dataset for load/scale tests: 100k users, 10M tasks, Zipf-distributed owners
+  python -m seeds.seed_data --generate --users 100000 --total-tasks 10000000 --seed 42 --workers 8
+
 If both --base and --user-email/--tasks are provided, base seeding runs first.
 """
 
@@ -41,6 +50,8 @@ def seed_base():
                     status=TaskStatus.pending if i < 3 else TaskStatus.in_progress
                 )
                 db.add(task)
+        db.flush()
+        task_stats_service.reconcile(db, [u.id for u in (u1, u2, u3)])
         db.commit()
         print("Base seed data inserted.")
     finally:
@@ -69,12 +80,187 @@ def seed_tasks_for_user(email: str, total_tasks: int):
                 status=TaskStatus.pending if i % 3 else TaskStatus.in_progress
             )
             db.add(t)
+        db.flush()
+        task_stats_service.reconcile(db, [user.id])
         db.commit()
         print(f"Done. User {email} now has {db.query(Task).filter(Task.owner_id==user.id).count()} tasks.")
     finally:
         db.close()
 
 
+GENERATED_PASSWORD = 'Password1!'
+_TITLE_VERBS = ("Review", "Fix", "Write", "Plan", "Update", "Test", "Deploy", "Refactor", "Document", "Migrate")
+_TITLE_NOUNS = ("report", "invoice", "release", "dashboard", "backlog", "schema", "API", "budget", "roadmap", "onboarding")
+_LOREM = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore "
+    "magna aliqua ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo "
+)
+
+
+def parse_status_mix(spec: str) -> dict:
+    """``pending=0.5,in_progress=0.3,done=0.2`` -> ``{TaskStatus.pending: 0.5, ...}`` (weights need not sum to 1)."""
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        mix[TaskStatus(name.strip())] = float(weight)
+    if not mix or min(mix.values()) < 0 or sum(mix.values()) <= 0:
+        raise ValueError(f"Invalid status mix: {spec}")
+    return mix
+
+
+def parse_range(spec: str) -> tuple[int, int]:
+    """``-30:90`` -> ``(-30, 90)``."""
+    low, _, high = spec.partition(':')
+    low, high = int(low), int(high or low)
+    if low > high:
+        raise ValueError(f"Invalid range: {spec}")
+    return low, high
+
+
+def zipf_task_counts(users: int, total_tasks: int, s: float, seed: int) -> list[int]:
+    """Tasks per user, summing to ``total_tasks``, Zipf-distributed with exponent ``s`` (0 = even).
+
+    Counts are allocated deterministically (largest remainder) and the ranks are then
+    shuffled across users, so the heaviest owners are not simply the first ids.
+    """
+    weights = [1 / rank ** s for rank in range(1, users + 1)]
+    scale = total_tasks / sum(weights)
+    expected = [w * scale for w in weights]
+    counts = [int(e) for e in expected]
+    by_remainder = sorted(range(users), key=lambda i: counts[i] - expected[i])
+    for i in by_remainder[:total_tasks - sum(counts)]:
+        counts[i] += 1
+    random.Random(seed).shuffle(counts)
+    return counts
+
+
+def plan_chunks(owner_ids: list[int], counts: list[int], chunk_size: int) -> list[list[tuple[int, int]]]:
+    """Split the per-owner counts into chunks of ``chunk_size`` rows, as ``[(owner_id, n), ...]`` segments."""
+    chunks, current, filled = [], [], 0
+    for owner_id, n in zip(owner_ids, counts):
+        while n:
+            take = min(n, chunk_size - filled)
+            current.append((owner_id, take))
+            filled += take
+            n -= take
+            if filled == chunk_size:
+                chunks.append(current)
+                current, filled = [], 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def generate_task_rows(
+    segments, rng: random.Random, status_mix: dict, base_date: date, due_days, no_due_ratio: float, description_size
+):
+    """``import_service.COPY_COLUMNS`` tuples for one chunk; due dates are ``base_date`` + ``due_days``."""
+    n = sum(count for _, count in segments)
+    statuses = rng.choices(list(status_mix), weights=list(status_mix.values()), k=n)
+    corpus = _LOREM * (description_size[1] // len(_LOREM) + 2)
+    rows = []
+    for owner_id, count in segments:
+        for _ in range(count):
+            size = rng.randint(*description_size)
+            start = rng.randrange(len(_LOREM))
+            rows.append((
+                owner_id,
+                f"{rng.choice(_TITLE_VERBS)} {rng.choice(_TITLE_NOUNS)} #{rng.randrange(1_000_000)}",
+                corpus[start:start + size] or None,
+                None if rng.random() < no_due_ratio else base_date + timedelta(days=rng.randint(*due_days)),
+                statuses[len(rows)],
+            ))
+    return rows
+
+
+def create_generated_users(session_factory, users: int, email_domain: str, chunk_size: int) -> list[int]:
+    """Insert ``user<n>@<email_domain>`` accounts in multi-row inserts; returns their ids in order."""
+    hashed = get_password_hash(GENERATED_PASSWORD)  # bcrypt once, shared by every generated user
+    ids = []
+    db = session_factory()
+    try:
+        if db.scalar(select(User.id).where(User.email == f"user1@{email_domain}")):
+            raise ValueError(f"Users @{email_domain} already exist; pass another --email-domain.")
+        stmt = insert(User).returning(User.id, sort_by_parameter_order=True)
+        for start in range(1, users + 1, chunk_size):
+            rows = [
+                {"email": f"user{i}@{email_domain}", "hashed_password": hashed, "role": UserRole.user}
+                for i in range(start, min(start + chunk_size, users + 1))
+            ]
+            ids.extend(db.scalars(stmt, rows))
+            db.commit()
+        return ids
+    finally:
+        db.close()
+
+
+def generate(
+    users: int,
+    total_tasks: int,
+    *,
+    seed: int = 0,
+    zipf_s: float = 1.1,
+    status_mix: dict | None = None,
+    base_date: date | None = None,
+    due_days: tuple[int, int] = (-30, 90),
+    no_due_ratio: float = 0.2,
+    description_size: tuple[int, int] = (0, 400),
+    email_domain: str = 'load.example.com',
+    chunk_size: int = 5000,
+    workers: int = 4,
+    session_factory=SessionLocal,
+) -> list[int]:
+    """Create ``users`` users and ``total_tasks`` tasks spread over them; returns the new user ids.
+
+    The same arguments always produce the same data, whatever ``workers`` is: every
+    chunk has its own RNG seeded from ``(seed, chunk index)``. Due dates are spread
+    around ``base_date`` (default: today), so pass it too to reproduce a dataset
+    on a later day. Chunks are written and committed concurrently, each with its
+    ``task_stats`` counters.
+    """
+    status_mix = status_mix or {TaskStatus.pending: 0.5, TaskStatus.in_progress: 0.3, TaskStatus.done: 0.2}
+    base_date = base_date or date.today()
+    started = time.perf_counter()
+    owner_ids = create_generated_users(session_factory, users, email_domain, chunk_size)
+    print(f"Due dates are spread around {base_date} (pass --base-date {base_date} to reproduce this run).")
+    print(f"Created {users} users @{email_domain} in {time.perf_counter() - started:.1f}s.", flush=True)
+
+    chunks = plan_chunks(owner_ids, zipf_task_counts(users, total_tasks, zipf_s, seed), chunk_size)
+    written = 0
+
+    def write(index: int) -> int:
+        rows = generate_task_rows(
+            chunks[index],
+            random.Random(f"{seed}:{index}"),
+            status_mix,
+            base_date,
+            due_days,
+            no_due_ratio,
+            description_size,
+        )
+        db = session_factory()
+        try:
+            import_service.write_task_rows(db, rows)
+            task_stats_service.apply(db, Counter((owner_id, status) for owner_id, _, _, _, status in rows))
+            db.commit()
+        finally:
+            db.close()
+        return len(rows)
+
+    probe = session_factory()
+    if probe.get_bind().dialect.name == 'sqlite':
+        workers = 1  # SQLite allows one writer at a time
+    probe.close()
+    tasks_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for n in pool.map(write, range(len(chunks))):
+            written += n
+            elapsed = time.perf_counter() - tasks_started
+            print(f"  tasks written: {written}/{total_tasks}  ({written / elapsed:,.0f} rows/s)", flush=True)
+    print(f"Done. Generated {written} tasks in {time.perf_counter() - started:.1f}s.")
+    return owner_ids
+
+
 def run():  # backward compatibility
     seed_base()
 
@@ -84,9 +270,23 @@ def main():
     parser.add_argument('--base', action='store_true', help='Run base seeding (3 users + 3 tasks each)')
     parser.add_argument('--user-email', type=str, help='User email to seed tasks for')
     parser.add_argument('--tasks', type=int, help='Ensure this total number of tasks for the user')
+    gen = parser.add_argument_group('synthetic data (--generate)')
+    gen.add_argument('--generate', action='store_true', help='Generate a synthetic dataset for load/scale tests')
+    gen.add_argument('--users', type=int, default=1000, help='Users to create')
+    gen.add_argument('--total-tasks', type=int, default=100000, help='Tasks to create across those users')
+    gen.add_argument('--seed', type=int, default=0, help='RNG seed; the same arguments always generate the same data')
+    gen.add_argument('--zipf-s', type=float, default=1.1, help='Zipf exponent of tasks per user (0 = even spread)')
+    gen.add_argument('--status-mix', default='pending=0.5,in_progress=0.3,done=0.2', help='Relative status weights')
+    gen.add_argument('--base-date', type=date.fromisoformat, help='Anchor of --due-days, YYYY-MM-DD (default: today); fix it to reproduce a dataset on another day')
+    gen.add_argument('--due-days', default='-30:90', help='Due dates drawn from base date +MIN..+MAX days')
+    gen.add_argument('--no-due-ratio', type=float, default=0.2, help='Share of tasks without a due date')
+    gen.add_argument('--description-size', default='0:400', help='Description length range in characters (0 = none)')
+    gen.add_argument('--email-domain', default='load.example.com', help='Generated users are user<n>@<domain>')
+    gen.add_argument('--chunk-size', type=int, default=5000, help='Rows per insert/COPY and per commit')
+    gen.add_argument('--workers', type=int, default=4, help='Chunks written concurrently (1 on SQLite)')
     args = parser.parse_args()
 
-    if not any([args.base, args.user_email]):
+    if not any([args.base, args.user_email, args.generate]):
         parser.print_help()
         return
 
@@ -98,6 +298,25 @@ def main():
     elif args.user_email and not args.tasks:
         print('--tasks required when --user-email is provided')
 
+    if args.generate:
+        try:
+            generate(
+                args.users,
+                args.total_tasks,
+                seed=args.seed,
+                zipf_s=args.zipf_s,
+                status_mix=parse_status_mix(args.status_mix),
+                base_date=args.base_date,
+                due_days=parse_range(args.due_days),
+                no_due_ratio=args.no_due_ratio,
+                description_size=parse_range(args.description_size),
+                email_domain=args.email_domain,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+            )
+        except ValueError as e:
+            print(e)
+
 
 if __name__ == "__main__":
     main()
@@ -1,121 +1,241 @@
 #!/usr/bin/env python3
 """
-Script to visualize the database structure and current data
+Inspect the task tracker database: schema, summary statistics and streamed dumps.
+
+Every subcommand works in bounded memory whatever the table sizes: statistics
+are grouped aggregate queries, and dumps stream rows in id order with
+``yield_per`` (a server-side cursor on Postgres), joining owner emails in the
+same query.
+
+Usage examples:
+  python show_database.py schema
+  python show_database.py stats --top 10
+  python show_database.py dump tasks --owner-email alice@example.com --limit 100
+  python show_database.py dump tasks --after-id 50000 --json > tasks.ndjson
+  python show_database.py dump users --json
 """
+import argparse
+import json
 import os
 import sys
+from datetime import date
+from typing import Any, Dict, Iterator
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import Session
+
 from app.db.session import SessionLocal
-from app.models.user import User, UserRole
 from app.models.task import Task, TaskStatus
-from sqlalchemy import text
-from datetime import datetime
+from app.models.task_stats import TaskStats
+from app.models.user import User
+
+TASK_COLUMNS = ("id", "title", "description", "status", "due_date", "owner_id", "created_at", "updated_at")
+
+
+def _emit_json(obj: Any) -> None:
+    sys.stdout.write(json.dumps(obj, default=str) + "\n")
+
+
+def schema(db: Session) -> Dict[str, Any]:
+    """Tables with their columns, indexes and foreign keys, as the database reports them."""
+    inspector = inspect(db.get_bind())
+    tables = {}
+    for table in sorted(inspector.get_table_names()):
+        tables[table] = {
+            "columns": [
+                {"name": c["name"], "type": str(c["type"]), "nullable": c["nullable"], "default": c.get("default")}
+                for c in inspector.get_columns(table)
+            ],
+            "primary_key": inspector.get_pk_constraint(table).get("constrained_columns", []),
+            "indexes": [
+                {"name": i["name"], "columns": i["column_names"], "unique": bool(i["unique"])}
+                for i in inspector.get_indexes(table)
+            ],
+            "foreign_keys": [
+                {
+                    "columns": fk["constrained_columns"],
+                    "references": f"{fk['referred_table']}({', '.join(fk['referred_columns'])})",
+                    "on_delete": (fk.get("options") or {}).get("ondelete"),
+                }
+                for fk in inspector.get_foreign_keys(table)
+            ],
+        }
+    return tables
+
+
+def stats(db: Session, top: int = 5) -> Dict[str, Any]:
+    """Counts by role and status, overdue tasks and the largest owners: one grouped query each."""
+    users_by_role = {role.value: n for role, n in db.execute(select(User.role, func.count()).group_by(User.role))}
+    tasks_by_status = dict.fromkeys((s.value for s in TaskStatus), 0)
+    tasks_by_status.update({s.value: n for s, n in db.execute(select(Task.status, func.count()).group_by(Task.status))})
+    overdue = db.scalar(
+        select(func.count()).select_from(Task).where(
+            Task.due_date != None, Task.due_date < date.today(), Task.status != TaskStatus.done  # noqa: E711
+        )
+    )
+    per_owner = (
+        select(Task.owner_id, func.count().label("tasks"))
+        .group_by(Task.owner_id)
+        .order_by(func.count().desc())
+        .limit(top)
+        .subquery()
+    )
+    top_owners = [
+        {"owner_id": owner_id, "email": email, "tasks": n}
+        for owner_id, email, n in db.execute(
+            select(per_owner.c.owner_id, User.email, per_owner.c.tasks)
+            .join(User, User.id == per_owner.c.owner_id)
+            .order_by(per_owner.c.tasks.desc())
+        )
+    ]
+    return {
+        "users": {"total": sum(users_by_role.values()), "by_role": users_by_role},
+        "tasks": {"total": sum(tasks_by_status.values()), "by_status": tasks_by_status, "overdue": overdue},
+        "top_owners": top_owners,
+    }
+
+
+def iter_tasks(
+    db: Session, *, owner_email: str | None = None, after_id: int = 0, limit: int | None = None, batch_size: int = 1000
+) -> Iterator[Dict[str, Any]]:
+    """Tasks in id order with their owner's email, streamed ``batch_size`` rows at a time.
+
+    Resume a dump with ``after_id`` set to the last id printed.
+    """
+    query = (
+        select(*(getattr(Task, c) for c in TASK_COLUMNS), User.email.label("owner_email"))
+        .join(User, User.id == Task.owner_id)
+        .where(Task.id > after_id)
+        .order_by(Task.id)
+        .limit(limit)
+        .execution_options(yield_per=batch_size)
+    )
+    if owner_email:
+        query = query.where(User.email == owner_email)
+    for row in db.execute(query):
+        task = row._asdict()
+        task["status"] = task["status"].value
+        yield task
+
 
-def show_database_structure():
+def iter_users(db: Session, *, after_id: int = 0, limit: int | None = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """Users in id order with their task count (read from the ``task_stats`` counters)."""
+    query = (
+        select(
+            User.id,
+            User.email,
+            User.role,
+            User.created_at,
+            func.coalesce(TaskStats.pending + TaskStats.in_progress + TaskStats.done, 0).label("tasks"),
+        )
+        .outerjoin(TaskStats, TaskStats.owner_id == User.id)
+        .where(User.id > after_id)
+        .order_by(User.id)
+        .limit(limit)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in db.execute(query):
+        user = row._asdict()
+        user["role"] = user["role"].value
+        yield user
+
+
+def _print_schema(tables: Dict[str, Any]) -> None:
+    print("=" * 80)
+    print("🗂️  DATABASE SCHEMA")
+    print("=" * 80)
+    for name, table in tables.items():
+        print(f"\n📋 {name.upper()}  (primary key: {', '.join(table['primary_key']) or '-'})")
+        for c in table["columns"]:
+            default = f" default {c['default']}" if c["default"] is not None else ""
+            print(f"   • {c['name']} {c['type']}{'' if c['nullable'] else ' NOT NULL'}{default}")
+        for fk in table["foreign_keys"]:
+            on_delete = f" ON DELETE {fk['on_delete']}" if fk["on_delete"] else ""
+            print(f"   → {', '.join(fk['columns'])} references {fk['references']}{on_delete}")
+        for i in table["indexes"]:
+            print(f"   ⚡ {i['name']} ({', '.join(i['columns'])}){' UNIQUE' if i['unique'] else ''}")
+
+
+def _print_stats(summary: Dict[str, Any]) -> None:
     print("=" * 80)
-    print("📊 TASK TRACKER DATABASE STRUCTURE")
+    print("📊 DATABASE STATISTICS")
     print("=" * 80)
-    
+    users, tasks = summary["users"], summary["tasks"]
+    print("\n👥 User Statistics:")
+    print(f"   Total Users: {users['total']}")
+    for role, n in sorted(users["by_role"].items()):
+        print(f"   {role.capitalize()} Users: {n}")
+    print("\n📋 Task Statistics:")
+    print(f"   Total Tasks: {tasks['total']}")
+    for status, n in tasks["by_status"].items():
+        print(f"   {status.replace('_', ' ').title()}: {n}")
+    print(f"   Overdue: {tasks['overdue']}")
+    print("\n🏆 Largest Owners:")
+    for owner in summary["top_owners"]:
+        print(f"   {owner['email']} (id {owner['owner_id']}): {owner['tasks']} tasks")
+
+
+def _print_task(task: Dict[str, Any]) -> None:
+    print(
+        f"{task['id']}\t{task['status']}\t{task['due_date'] or '-'}\t{task['owner_email']}\t"
+        f"{task['title']}\t{task['created_at']:%Y-%m-%d %H:%M:%S}"
+    )
+
+
+def _print_user(user: Dict[str, Any]) -> None:
+    print(f"{user['id']}\t{user['role']}\t{user['tasks']}\t{user['email']}\t{user['created_at']:%Y-%m-%d %H:%M:%S}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="JSON output (NDJSON, one row per line, for dumps)")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("schema", parents=[common], help="Tables, columns, indexes and foreign keys")
+    stats_cmd = commands.add_parser("stats", parents=[common], help="Summary statistics from grouped aggregates")
+    stats_cmd.add_argument("--top", type=int, default=5, help="How many of the largest owners to list")
+    dump_cmd = commands.add_parser("dump", parents=[common], help="Stream users or tasks in id order")
+    dump_cmd.add_argument("table", choices=("users", "tasks"))
+    dump_cmd.add_argument("--owner-email", help="Only this owner's tasks")
+    dump_cmd.add_argument("--after-id", type=int, default=0, help="Start after this id (resume a previous dump)")
+    dump_cmd.add_argument("--limit", type=int, help="Stop after this many rows")
+    dump_cmd.add_argument("--batch-size", type=int, default=1000, help="Rows fetched per round trip")
+    args = parser.parse_args(argv)
+
     db = SessionLocal()
     try:
-        # Show table structure
-        print("\n🗂️  DATABASE SCHEMA:")
-        print("-" * 50)
-        
-        # Show Users table structure
-        print("\n👥 USERS Table:")
-        print("   • id (Primary Key, Auto-increment)")
-        print("   • email (Unique, Indexed)")
-        print("   • hashed_password (String 255)")
-        print("   • role (Enum: 'user' | 'admin')")
-        print("   • created_at (Timestamp)")
-        print("   • Relationship: One-to-Many with Tasks")
-        
-        # Show Tasks table structure  
-        print("\n📋 TASKS Table:")
-        print("   • id (Primary Key, Auto-increment)")
-        print("   • owner_id (Foreign Key → users.id, Cascade Delete)")
-        print("   • title (String 255, Required)")
-        print("   • description (Text, Optional)")
-        print("   • due_date (Date, Optional)")
-        print("   • status (Enum: 'pending' | 'in_progress' | 'done')")
-        print("   • created_at (Timestamp)")
-        print("   • updated_at (Timestamp, Auto-update)")
-        print("   • Relationship: Many-to-One with User")
-        
-        # Show current data
-        print("\n" + "=" * 80)
-        print("📈 CURRENT DATABASE CONTENT")
-        print("=" * 80)
-        
-        # Users data
-        users = db.query(User).all()
-        print(f"\n👥 USERS ({len(users)} total):")
-        print("-" * 50)
-        for user in users:
-            task_count = db.query(Task).filter(Task.owner_id == user.id).count()
-            print(f"   🆔 ID: {user.id}")
-            print(f"   ✉️  Email: {user.email}")
-            print(f"   🛡️  Role: {user.role.value}")
-            print(f"   📅 Created: {user.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"   📝 Tasks: {task_count}")
-            print()
-        
-        # Tasks data
-        tasks = db.query(Task).all()
-        print(f"\n📋 TASKS ({len(tasks)} total):")
-        print("-" * 50)
-        for task in tasks:
-            owner = db.query(User).filter(User.id == task.owner_id).first()
-            print(f"   🆔 ID: {task.id}")
-            print(f"   📝 Title: {task.title}")
-            print(f"   📄 Description: {task.description or 'N/A'}")
-            print(f"   👤 Owner: {owner.email if owner else 'Unknown'}")
-            print(f"   📊 Status: {task.status.value}")
-            print(f"   📅 Due Date: {task.due_date or 'N/A'}")
-            print(f"   🕐 Created: {task.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"   🔄 Updated: {task.updated_at.strftime('%Y-%m-%d %H:%M:%S')}")
-            print()
-        
-        # Summary statistics
-        print("=" * 80)
-        print("📊 DATABASE STATISTICS")
-        print("=" * 80)
-        
-        total_users = db.query(User).count()
-        admin_users = db.query(User).filter(User.role == UserRole.admin).count()
-        regular_users = db.query(User).filter(User.role == UserRole.user).count()
-        
-        total_tasks = db.query(Task).count()
-        pending_tasks = db.query(Task).filter(Task.status == TaskStatus.pending).count()
-        in_progress_tasks = db.query(Task).filter(Task.status == TaskStatus.in_progress).count()
-        done_tasks = db.query(Task).filter(Task.status == TaskStatus.done).count()
-        
-        print(f"\n👥 User Statistics:")
-        print(f"   Total Users: {total_users}")
-        print(f"   Admin Users: {admin_users}")
-        print(f"   Regular Users: {regular_users}")
-        
-        print(f"\n📋 Task Statistics:")
-        print(f"   Total Tasks: {total_tasks}")
-        print(f"   Pending: {pending_tasks}")
-        print(f"   In Progress: {in_progress_tasks}")
-        print(f"   Done: {done_tasks}")
-        
-        # Relationships demonstration
-        print(f"\n🔗 Relationship Examples:")
-        if users and tasks:
-            sample_user = users[0]
-            user_tasks = db.query(Task).filter(Task.owner_id == sample_user.id).all()
-            print(f"   User '{sample_user.email}' owns {len(user_tasks)} tasks:")
-            for task in user_tasks[:3]:  # Show first 3
-                print(f"     • {task.title}")
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
+        if args.command == "schema":
+            tables = schema(db)
+            if args.json:
+                _emit_json(tables)
+            else:
+                _print_schema(tables)
+        elif args.command == "stats":
+            summary = stats(db, top=args.top)
+            if args.json:
+                _emit_json(summary)
+            else:
+                _print_stats(summary)
+        else:
+            if args.table == "tasks":
+                rows = iter_tasks(
+                    db, owner_email=args.owner_email, after_id=args.after_id, limit=args.limit, batch_size=args.batch_size
+                )
+                print_row = _print_task
+            else:
+                rows = iter_users(db, after_id=args.after_id, limit=args.limit, batch_size=args.batch_size)
+                print_row = _print_user
+            for row in rows:
+                (_emit_json if args.json else print_row)(row)
+    except BrokenPipeError:  # e.g. piped into head
+        sys.stderr.close()
     finally:
         db.close()
+    return 0
+
 
 if __name__ == "__main__":
-    show_database_structure()
+    sys.exit(main())
@@ -10,6 +10,7 @@ from app.db.session import get_db
 from app.models.user import User, UserRole, Base  # include Base here
 from app.models.task import Task
 from app.core.security import get_password_hash
+from app.services.task_search import install_sqlite_fts
 
 # Use cross-platform temporary file
 TEST_DB_PATH = os.path.join(tempfile.gettempdir(), "test.db")
@@ -23,6 +24,7 @@ engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 Base.metadata.create_all(bind=engine)
+install_sqlite_fts(engine)
 
 # Dependency override
 def override_get_db():
@@ -38,6 +40,14 @@ app.dependency_overrides[get_db] = override_get_db
 def client():
     return TestClient(app)
 
+@pytest.fixture
+def db_session():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 @pytest.fixture
 def user_token_headers(client):
     email = "user@example.com"
@@ -70,3 +80,13 @@ def admin_token_headers(client):
     )
     token = resp.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    # off by default (TASK_RESPONSE_CACHE_MAX_BYTES=0); a fresh, enabled one per test
+    from app.core.cache import TTLCache
+    from app.services import task_cache
+
+    cache = TTLCache(maxsize=100, ttl=60, maxbytes=1024 * 1024, weigh=lambda entry: len(entry[1]))
+    monkeypatch.setattr(task_cache, "responses", cache)
+    return cache
@@ -31,3 +31,116 @@ def test_login_wrong_password(client):
         headers={"Content-Type": "application/x-www-form-urlencoded"},
     )
     assert resp.status_code == 401
+
+
+def _login(client, email):
+    client.post("/auth/register", json={"email": email, "password": "password123"})
+    resp = client.post("/auth/login", data={"username": email, "password": "password123"})
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def test_authenticated_requests_reuse_cached_principal(client):
+    from sqlalchemy import event
+    from conftest import engine
+
+    headers = _login(client, "cached-principal@example.com")
+    assert client.get("/tasks/?limit=1", headers=headers).status_code == 200
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert client.get("/tasks/?limit=1", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert not [s for s in statements if "FROM users" in s]
+
+
+def test_role_change_invalidates_cached_principal(client, admin_token_headers):
+    headers = _login(client, "promoted@example.com")
+    me = client.get("/tasks/?limit=1", headers=headers)  # caches the principal as a plain user
+    assert me.status_code == 200
+    assert client.get("/users/", headers=headers).status_code == 403
+
+    user_id = next(u["id"] for u in client.get("/users/", headers=admin_token_headers).json() if u["email"] == "promoted@example.com")
+    assert client.patch(f"/users/{user_id}", json={"role": "admin"}, headers=admin_token_headers).status_code == 200
+    assert client.get("/users/", headers=headers).status_code == 200
+
+    assert client.delete(f"/users/{user_id}", headers=admin_token_headers).status_code == 204
+    assert client.get("/tasks/?limit=1", headers=headers).status_code == 401
+
+
+def test_decode_token_caches_verified_payload_until_exp():
+    import pytest
+    from fastapi import HTTPException
+    from app.core.security import create_access_token, decode_token, verified_tokens
+
+    token = create_access_token({"sub": "decode-cache@example.com"})
+    first = decode_token(token)
+    first["sub"] = "tampered"  # callers get copies, never the cached dict
+    hits = verified_tokens.hits
+    assert decode_token(token)["sub"] == "decode-cache@example.com"
+    assert verified_tokens.hits == hits + 1
+
+    expired = create_access_token({"sub": "decode-cache@example.com"}, expires_minutes=-1)
+    with pytest.raises(HTTPException):
+        decode_token(expired)
+
+
+def test_password_pool_fails_fast_when_queue_is_full():
+    import threading
+    import pytest
+    from fastapi import HTTPException
+    from app.core.password_pool import PasswordHashPool
+
+    pool = PasswordHashPool(workers=1, max_queue=1)
+    release = threading.Event()
+    running = [pool.submit(release.wait), pool.submit(release.wait)]
+    with pytest.raises(HTTPException) as exc_info:
+        pool.submit(release.wait)
+    assert exc_info.value.status_code == 503
+    release.set()
+    assert all(f.result(timeout=5) for f in running)
+    stats = pool.stats()
+    assert stats["completed"] == 2 and stats["rejected"] == 1 and stats["pending"] == 0
+
+
+def test_stateless_tokens_authorize_from_claims_and_revoke_on_role_change(client, admin_token_headers, monkeypatch):
+    from sqlalchemy import event
+    from conftest import engine
+    from app.core.config import settings
+    from app.core.security import decode_token
+
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    headers = _login(client, "stateless@example.com")
+    claims = decode_token(headers["Authorization"].split()[1])
+    assert claims["role"] == "user" and "uid" in claims and "token_epoch" in claims
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert client.get("/tasks/?limit=1&include_total=false", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert not [s for s in statements if "FROM users" in s]
+
+    assert client.patch(f"/users/{claims['uid']}", json={"role": "admin"}, headers=admin_token_headers).status_code == 200
+    resp = client.get("/tasks/?limit=1", headers=headers)
+    assert resp.status_code == 401 and resp.json()["detail"] == "Token revoked"
+
+    fresh = _login(client, "stateless@example.com")
+    assert decode_token(fresh["Authorization"].split()[1])["token_epoch"] == claims["token_epoch"] + 1
+    assert client.get("/users/", headers=fresh).status_code == 200
+
+
+def test_bump_epoch_upserts(db_session):
+    from app.services import token_epoch_service
+
+    user_id = 987654  # no epoch row yet
+    for expected in (1, 2):
+        token_epoch_service.bump_epoch(db_session, user_id)
+        db_session.commit()
+        token_epoch_service.forget(user_id)
+        assert token_epoch_service.get_epoch(db_session, user_id) == expected
+    token_epoch_service.forget(user_id)
@@ -0,0 +1,38 @@
+import time
+
+from app.core.cache import TTLCache
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expiry_and_per_entry_ttl():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("short", "x", ttl=0.01)
+    cache.set("long", "y")
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    assert cache.get("long") == "y"
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_ttl_cache_byte_bound():
+    cache = TTLCache(maxsize=100, ttl=60, maxbytes=10, weigh=len)
+    cache.set("a", b"xxxx")
+    cache.set("b", b"yyyy")
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", b"zzzz")
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+    cache.set("huge", b"h" * 11)  # never fits
+    assert cache.get("huge") is None
+    cache.set("a", b"x")
+    assert cache.stats()["bytes"] == 5
@@ -0,0 +1,95 @@
+import json
+import logging
+import queue
+
+from app.core.log_pipeline import BoundedQueueHandler, LogPipeline
+from app.core.logging import JsonFormatter
+
+
+def _record(msg, *args):
+    return logging.LogRecord("business", logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_queue_handler_drops_and_counts_when_full():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), policy="drop")
+    for i in range(3):
+        handler.emit(_record("step %d", i))
+    assert handler.dropped == 2
+    assert handler.queue.get_nowait().getMessage() == "step 0"
+
+    blocking = BoundedQueueHandler(queue.Queue(maxsize=1), policy="block", block_timeout=0.01)
+    blocking.emit(_record("first"))
+    blocking.emit(_record("second"))
+    assert blocking.dropped == 1
+
+
+def test_pipeline_flushes_everything_to_rotating_file_on_stop(tmp_path):
+    path = tmp_path / "app.log"
+    pipeline = LogPipeline(JsonFormatter(), capacity=1000, policy="block", block_timeout=1,
+                           batch_size=16, file_path=str(path), file_max_bytes=4096, file_backup_count=50)
+    for i in range(200):
+        pipeline.handler.emit(_record("step %d", i))
+    pipeline.stop()
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) > 1  # rotated
+    lines = [json.loads(line) for f in files for line in f.read_text().splitlines()]
+    assert sorted(int(line["msg"].split()[1]) for line in lines) == list(range(200))
+    stats = pipeline.stats()
+    assert stats["written"] == 200 and stats["dropped"] == 0 and stats["batches"] < 200
+
+
+def test_summary_mode_aggregates_steps_into_request_end(client, user_token_headers, caplog, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "LOG_BUSINESS_MODE", "summary")
+    caplog.set_level(logging.INFO)
+    created = client.post("/tasks/", json={"title": "Summary mode task"}, headers=user_token_headers).json()
+    caplog.clear()
+
+    client.put(f"/tasks/{created['id']}", json={"status": "done"}, headers=user_token_headers)
+    ends = [r for r in caplog.records if r.getMessage() == "request_end"]
+    assert len(ends) == 1
+    assert "task_updated_successfully" in [s["step"] for s in ends[0].steps]
+    assert not [r for r in caplog.records if r.name == "business"]
+    assert not [r for r in caplog.records if r.getMessage() == "request_start"]
+
+    # Successful requests are sampled; warnings are logged at once and force the summary out
+    monkeypatch.setattr(settings, "LOG_SUMMARY_SAMPLE_RATE", 0.0)
+    caplog.clear()
+    client.get(f"/tasks/{created['id']}", headers=user_token_headers)
+    assert not [r for r in caplog.records if r.getMessage() == "request_end"]
+    client.get("/tasks/999999", headers=user_token_headers)
+    assert [r.getMessage() for r in caplog.records if r.name == "business"] == ["Business: task_not_found"]
+    end = next(r for r in caplog.records if r.getMessage() == "request_end")
+    assert end.status == 404 and end.steps[-1] == {"step": "task_not_found", "ms": end.steps[-1]["ms"], "level": "warning"}
+
+
+def test_fast_formatter_matches_reference_output():
+    import sys
+    from app.core.logging import FastJsonFormatter
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+    records = [
+        _record("request_end"),
+        logging.LogRecord("app", logging.ERROR, __file__, 7, "request_error", None, exc_info),
+    ]
+    records[0].__dict__.update(cid="abc", status=200, duration_ms=1.5, user_id=3, steps=[{"step": "x", "ms": 0.1}])
+    records[0].created = 1760000000.25
+    records[1].created = 1760000000.0
+    for record in records:
+        assert json.loads(FastJsonFormatter().format(record)) == json.loads(JsonFormatter().format(record))
+
+
+def test_lazy_details_are_only_built_when_emitted(caplog):
+    from app.core.logging import log_business_step
+
+    calls = []
+    caplog.set_level(logging.WARNING, logger="business")
+    log_business_step("lazy_info", lambda: calls.append(1) or {"a": 1})
+    assert calls == []
+    log_business_step("lazy_warning", lambda: calls.append(1) or {"a": 1}, level="warning")
+    assert calls == [1] and caplog.records[-1].a == 1
@@ -0,0 +1,22 @@
+import logging
+
+
+def test_request_context_headers(client, user_token_headers):
+    resp = client.get("/health")
+    assert resp.headers["x-content-type-options"] == "nosniff"
+    assert resp.headers["x-frame-options"] == "DENY"
+    assert resp.headers["content-security-policy"] == "default-src 'self'"
+    assert float(resp.headers["x-process-time-ms"]) >= 0
+    assert len(resp.headers["x-correlation-id"]) == 36
+    assert "unsafe-inline" in client.get("/docs").headers["content-security-policy"]
+
+    streamed = client.get("/tasks/export", headers=user_token_headers)
+    assert streamed.status_code == 200 and "x-correlation-id" in streamed.headers
+
+
+def test_request_end_logged_with_user_and_status(client, user_token_headers, caplog):
+    caplog.set_level(logging.INFO, logger="app")
+    resp = client.get("/tasks/?limit=1", headers=user_token_headers)
+    end = next(r for r in caplog.records if r.getMessage() == "request_end")
+    assert end.cid == resp.headers["x-correlation-id"]
+    assert end.status == 200 and end.path == "/tasks/" and end.user_id is not None
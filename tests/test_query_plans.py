@@ -0,0 +1,136 @@
+"""Query-plan regression check for the task listing queries.
+
+Runs ``task_service.list_tasks`` and ``task_service.list_version`` (the ETag /
+response-cache version of a conditional listing) for every filter combination,
+captures the SQL they actually send, EXPLAINs each statement and fails when ``tasks`` is read with
+a full table scan. Uses the SQLite test database by default; point
+``QUERY_PLAN_DATABASE_URL`` at a migrated Postgres database to check there
+(sequential scans are disabled for the EXPLAIN so a missing index still shows
+up as a ``Seq Scan`` on small tables).
+"""
+import itertools
+import os
+import re
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.models.user import User
+from app.services import task_service
+
+SCOPES = ["owner", "admin"]
+STATUSES = [None, "pending"]
+DUE_RANGES = [None, (date(2025, 1, 1), date(2025, 12, 31))]
+QUERIES = [None, "report"]
+PAGINGS = ["offset", "cursor"]
+
+
+@contextmanager
+def captured_statements(bind):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if re.search(r"\bFROM tasks\b", statement):
+            statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+
+def explain(conn, statement, parameters) -> list[str]:
+    if conn.dialect.name == "postgresql":
+        with conn.begin():
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).fetchall()
+        return [r[0] for r in rows]
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    return [r[-1] for r in rows]
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    # SQLite: "SCAN tasks" (table) vs "SCAN tasks USING INDEX ..." (ordered index walk).
+    # Postgres: "Seq Scan on tasks".
+    return [line for line in plan if re.search(r"^SCAN tasks$|Seq Scan on tasks\b", line.strip())]
+
+
+@pytest.fixture
+def plan_db(db_session):
+    url = os.environ.get("QUERY_PLAN_DATABASE_URL")
+    if not url:
+        yield db_session
+        return
+    engine = create_engine(url)
+    with Session(engine) as db:
+        yield db
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "scope,status,due_range,q,paging",
+    list(itertools.product(SCOPES, STATUSES, DUE_RANGES, QUERIES, PAGINGS)),
+)
+def test_list_tasks_never_full_scans(plan_db, scope, status, due_range, q, paging):
+    bind = plan_db.get_bind()
+    cursor = None
+    if paging == "cursor":
+        cursor = task_service.encode_cursor(Task(id=10**9, created_at=datetime(2025, 6, 1)))
+    with captured_statements(bind) as statements:
+        task_service.list_tasks(
+            plan_db,
+            owner=User(id=1),
+            all_tasks=scope == "admin",
+            q=q,
+            status=status,
+            due_after=due_range[0] if due_range else None,
+            due_before=due_range[1] if due_range else None,
+            cursor=cursor,
+        )
+        task_service.list_version(
+            plan_db,
+            owner=User(id=1),
+            all_tasks=scope == "admin",
+            q=q,
+            status=status,
+            due_after=due_range[0] if due_range else None,
+            due_before=due_range[1] if due_range else None,
+        )
+    assert any("max(" in statement for statement, _ in statements)
+    with bind.connect() as conn:
+        for statement, parameters in statements:
+            plan = explain(conn, statement, parameters)
+            # An unfiltered admin COUNT(*) has to visit every row whatever the plan.
+            if scope == "admin" and not (status or due_range or q) and "count(" in statement:
+                continue
+            assert not full_scans(plan), f"full scan of tasks:\n{statement}\n" + "\n".join(plan)
+
+
+def test_owner_list_version_is_index_only(plan_db):
+    bind = plan_db.get_bind()
+    with captured_statements(bind) as statements:
+        task_service.list_version(plan_db, owner=User(id=1))
+    (statement, parameters), = statements
+    with bind.connect() as conn:
+        plan = "\n".join(explain(conn, statement, parameters))
+    # SQLite: "SEARCH tasks USING COVERING INDEX ..."; Postgres: "Index Only Scan using ..."
+    assert re.search(r"COVERING INDEX ix_tasks_owner_updated|Index Only Scan using ix_tasks_owner_updated", plan), plan
+
+
+@pytest.mark.parametrize("owner_id", [1, None])
+def test_task_stats_never_full_scan(plan_db, owner_id):
+    from app.services import task_stats_service
+
+    bind = plan_db.get_bind()
+    with captured_statements(bind) as statements:
+        task_stats_service.get_stats(plan_db, owner_id)
+    assert statements  # the overdue count; the counters come from task_stats
+    with bind.connect() as conn:
+        for statement, parameters in statements:
+            plan = explain(conn, statement, parameters)
+            assert not full_scans(plan), f"full scan of tasks:\n{statement}\n" + "\n".join(plan)
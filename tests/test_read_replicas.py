@@ -0,0 +1,65 @@
+import os
+import tempfile
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db import session as db_session_module
+from app.models.task import Task
+from app.models.user import Base, User
+from app.services.task_search import install_sqlite_fts
+
+
+def _replica_with_marker(owner_id: int) -> str:
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'replica.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    install_sqlite_fts(engine)
+    with Session(engine) as s:
+        s.add(Task(owner_id=owner_id, title="ReplicaMarker only on the replica"))
+        s.commit()
+    engine.dispose()
+    return url
+
+
+def test_reads_use_replica_until_own_write(client, db_session, user_token_headers):
+    user = db_session.query(User).filter(User.email == "user@example.com").one()
+    db_session_module.configure_replicas([_replica_with_marker(user.id)])
+    db_session_module._recent_writers.clear()  # earlier tests may have left this user inside the window
+    try:
+        resp = client.get("/tasks/?q=ReplicaMarker", headers=user_token_headers)
+        assert [t["title"] for t in resp.json()["items"]] == ["ReplicaMarker only on the replica"]
+
+        # A committed write pins this user's reads to the primary for the read-your-writes window
+        assert client.post("/tasks/", json={"title": "Replica sticky write"}, headers=user_token_headers).status_code == 201
+        assert client.get("/tasks/?q=ReplicaMarker", headers=user_token_headers).json()["items"] == []
+        assert client.get("/tasks/?q=Replica sticky", headers=user_token_headers).json()["total"] == 1
+
+        # Another worker has no record of the write; the client carries it back instead
+        db_session_module._recent_writers.clear()
+        written = client.post("/tasks/", json={"title": "Replica cookie write"}, headers=user_token_headers)
+        assert float(written.headers["x-last-write"]) == float(client.cookies["last_write"])
+        db_session_module._recent_writers.clear()
+        assert client.get("/tasks/?q=ReplicaMarker", headers=user_token_headers).json()["items"] == []
+        client.cookies.clear()
+        header = {**user_token_headers, "X-Last-Write": written.headers["x-last-write"]}
+        assert client.get("/tasks/?q=ReplicaMarker", headers=header).json()["items"] == []
+        assert client.get("/tasks/?q=ReplicaMarker", headers=user_token_headers).json()["total"] == 1
+    finally:
+        db_session_module.configure_replicas([])
+        db_session_module._recent_writers.clear()
+
+
+def test_coalescing_keys_separate_primary_and_replica_reads(db_session):
+    from app.services import task_service
+
+    user = User(id=1)
+    db_session_module.configure_replicas([_replica_with_marker(user.id)])
+    replica = db_session_module.open_replica_session()
+    try:
+        keys = [task_service.flight_key(s, "page", user, False, ()) for s in (db_session, replica)]
+        assert keys[0] != keys[1]
+        assert db_session_module.read_target(replica) == "replica"
+    finally:
+        replica.close()
+        db_session_module.configure_replicas([])
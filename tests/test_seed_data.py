@@ -0,0 +1,36 @@
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.task import Task, TaskStatus
+from app.services import task_stats_service
+from seeds import seed_data
+
+
+def test_zipf_counts_are_exact_and_skewed():
+    counts = seed_data.zipf_task_counts(100, 10_000, 1.1, seed=3)
+    assert sum(counts) == 10_000 and counts == seed_data.zipf_task_counts(100, 10_000, 1.1, seed=3)
+    assert max(counts) > 10 * sorted(counts)[50]
+    assert set(seed_data.zipf_task_counts(10, 50, 0, seed=3)) == {5}
+    chunks = seed_data.plan_chunks(list(range(100)), counts, 999)
+    assert all(sum(n for _, n in c) == 999 for c in chunks[:-1]) and sum(n for c in chunks for _, n in c) == 10_000
+
+
+def test_generate_is_reproducible_and_keeps_stats(db_session):
+    factory = sessionmaker(bind=db_session.get_bind())
+    options = dict(seed=11, base_date=date(2030, 1, 1), due_days=(0, 9), status_mix={TaskStatus.pending: 1, TaskStatus.done: 1}, description_size=(0, 50), chunk_size=40)
+    runs = []
+    for domain, workers in (("gen-a.test", 1), ("gen-b.test", 3)):
+        owner_ids = seed_data.generate(6, 150, email_domain=domain, workers=workers, session_factory=factory, **options)
+        rows = db_session.execute(
+            select(Task.owner_id, Task.title, Task.description, Task.due_date, Task.status)
+            .where(Task.owner_id.in_(owner_ids)).order_by(Task.id)
+        ).all()
+        runs.append([(owner_ids.index(owner_id), *rest) for owner_id, *rest in rows])
+        assert task_stats_service.reconcile(db_session, owner_ids, fix=False) == {}
+
+    assert len(runs[0]) == 150 and runs[0] == runs[1]
+    assert {r[4] for r in runs[0]} == {TaskStatus.pending, TaskStatus.done}
+    assert all(r[2] is None or len(r[2]) <= 50 for r in runs[0])
+    assert all(r[3] is None or date(2030, 1, 1) <= r[3] <= date(2030, 1, 10) for r in runs[0])
@@ -0,0 +1,25 @@
+import show_database
+
+
+def test_show_database_stats_and_streamed_dump(client, db_session, user_token_headers):
+    for title in ("Inspect one", "Inspect two"):
+        client.post("/tasks/", json={"title": title}, headers=user_token_headers)
+
+    tables = show_database.schema(db_session)
+    assert {"users", "tasks", "task_stats"} <= set(tables)
+    assert "ix_tasks_owner_updated" in {i["name"] for i in tables["tasks"]["indexes"]}
+
+    summary = show_database.stats(db_session, top=1)
+    assert summary["tasks"]["total"] == sum(summary["tasks"]["by_status"].values()) >= 2
+    assert len(summary["top_owners"]) == 1
+
+    mine = list(show_database.iter_tasks(db_session, owner_email="user@example.com", batch_size=1))
+    assert {"Inspect one", "Inspect two"} <= {t["title"] for t in mine}
+    assert all(t["owner_email"] == "user@example.com" for t in mine)
+    ids = [t["id"] for t in mine]
+    assert ids == sorted(ids)
+    resumed = list(show_database.iter_tasks(db_session, owner_email="user@example.com", after_id=ids[0], limit=1))
+    assert [t["id"] for t in resumed] == ids[1:2]
+
+    users = {u["email"]: u for u in show_database.iter_users(db_session)}
+    assert users["user@example.com"]["tasks"] == len(mine)
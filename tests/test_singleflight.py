@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_threads_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def slow_query():
+        runs.append(1)
+        started.set()
+        release.wait(5)
+        return ["row"]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flight.do, "k", slow_query)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "k", slow_query) for _ in range(3)]
+        while flight.stats()["coalesced"] < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert runs == [1] and all(r is results[0] for r in results)
+    stats = flight.stats()
+    assert (stats["executions"], stats["coalesced"], stats["in_flight"]) == (1, 3, 0)
+    assert flight.do("k", lambda: "fresh") == "fresh"  # nothing is kept once the call is done
+
+
+def test_thread_errors_reach_every_caller():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "k", failing)
+        started.wait(5)
+        follower = pool.submit(flight.do, "k", failing)
+        while flight.stats()["coalesced"] < 1:
+            time.sleep(0.001)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    assert flight.stats()["errors"] == 1
+
+
+def test_async_callers_share_one_execution_and_survive_leader_cancel():
+    async def scenario():
+        flight = AsyncSingleFlight()
+        runs = []
+
+        async def query():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return ["row"]
+
+        results = await asyncio.gather(*(flight.do("k", query) for _ in range(5)))
+        assert len(runs) == 1 and all(r is results[0] for r in results)
+        assert flight.stats()["coalesced"] == 4
+
+        # A cancelled leader hands the work to a waiting caller instead of failing it
+        leader = asyncio.ensure_future(flight.do("c", query))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("c", query))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == ["row"]
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_task_listings_coalesce(client, user_token_headers, admin_token_headers):
+    from app.services import task_service
+
+    client.post("/tasks/", json={"title": "Coalesced listing"}, headers=user_token_headers)
+    before = task_service.list_flights.stats()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pages = list(pool.map(
+            lambda _: client.get("/tasks/?q=Coalesced listing&include_total=false", headers=user_token_headers).json(),
+            range(16),
+        ))
+    assert all(p == pages[0] for p in pages) and pages[0]["items"][0]["title"] == "Coalesced listing"
+    after = task_service.list_flights.stats()
+    assert after["executions"] + after["coalesced"] > before["executions"] + before["coalesced"]
+
+    diagnostics = client.get("/admin/diagnostics/coalescing", headers=admin_token_headers).json()
+    assert diagnostics["threadpool"]["executions"] == after["executions"]
@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+
+from app.models.task_stats import TaskStats
+from app.models.user import User
+from app.services import task_stats_service
+
+
+def _stats(client, headers, **params):
+    resp = client.get("/tasks/stats", params=params, headers=headers)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _diff(after, before):
+    return {k: after[k] - before[k] for k in after}
+
+
+def test_stats_follow_every_task_write(client, user_token_headers):
+    before = _stats(client, user_token_headers)
+    yesterday = str(date.today() - timedelta(days=1))
+
+    one = client.post("/tasks/", json={"title": "Stats one", "due_date": yesterday}, headers=user_token_headers).json()
+    client.put(f"/tasks/{one['id']}", json={"status": "in_progress"}, headers=user_token_headers)
+    client.put(f"/tasks/{one['id']}", json={"title": "Stats one renamed"}, headers=user_token_headers)
+    bulk = client.post("/tasks/bulk", json={"items": [{"title": "Stats b1"}, {"title": "Stats b2"}]}, headers=user_token_headers).json()
+    b1, b2 = (r["id"] for r in bulk["results"])
+    client.patch("/tasks/bulk", json={"items": [{"id": b1, "status": "done"}, {"id": b2, "status": "done"}]}, headers=user_token_headers)
+    client.request("DELETE", "/tasks/bulk", json={"ids": [b2]}, headers=user_token_headers)
+    client.post("/tasks/import", files={"file": ("t.csv", "title\nStats loaded\n", "text/csv")}, headers=user_token_headers)
+
+    assert _diff(_stats(client, user_token_headers), before) == {
+        "pending": 1, "in_progress": 1, "done": 1, "total": 3, "overdue": 1,
+    }
+    client.put(f"/tasks/{one['id']}", json={"status": "done"}, headers=user_token_headers)  # done is never overdue
+    client.delete(f"/tasks/{b1}", headers=user_token_headers)
+    assert _diff(_stats(client, user_token_headers), before) == {
+        "pending": 1, "in_progress": 0, "done": 1, "total": 2, "overdue": 0,
+    }
+
+
+def test_admin_wide_stats_and_reconcile(client, db_session, user_token_headers, admin_token_headers):
+    client.post("/tasks/", json={"title": "Stats admin view"}, headers=user_token_headers)
+    # Non-admins asking for all=true get their own numbers, as with the listing
+    assert _stats(client, user_token_headers, all=True) == _stats(client, user_token_headers)
+    everyone = _stats(client, admin_token_headers, all=True)
+    assert everyone["total"] >= _stats(client, user_token_headers)["total"] + _stats(client, admin_token_headers)["total"]
+
+    assert task_stats_service.reconcile(db_session, fix=False) == {}
+    user = db_session.query(User).filter(User.email == "user@example.com").one()
+    row = db_session.get(TaskStats, user.id)
+    row.pending += 5
+    db_session.commit()
+    drifted = task_stats_service.reconcile(db_session)
+    db_session.commit()
+    assert list(drifted) == [user.id]
+    assert drifted[user.id][0]["pending"] == drifted[user.id][1]["pending"] + 5
+    assert task_stats_service.reconcile(db_session, fix=False) == {}
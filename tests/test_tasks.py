@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 from datetime import date, timedelta
 
 def test_create_task(client, user_token_headers):
@@ -52,3 +55,293 @@ def test_admin_list_all(client, admin_token_headers, user_token_headers):
     data = resp_admin.json()
     titles = [t["title"] for t in data["items"]]
     assert any(x in titles for x in ["A1", "A2"]) and "AdminT" in titles
+
+
+def test_list_tasks_cursor_pagination(client, user_token_headers):
+    for i in range(5):
+        client.post("/tasks/", json={"title": f"CursorT{i}"}, headers=user_token_headers)
+    seen = []
+    resp = client.get("/tasks?q=CursorT&limit=2", headers=user_token_headers).json()
+    seen += [t["title"] for t in resp["items"]]
+    while resp["next_cursor"]:
+        resp = client.get(f"/tasks?q=CursorT&limit=2&cursor={resp['next_cursor']}", headers=user_token_headers).json()
+        assert resp["total"] == 5
+        seen += [t["title"] for t in resp["items"]]
+    assert seen == [f"CursorT{i}" for i in reversed(range(5))]
+
+
+def test_list_tasks_invalid_cursor(client, user_token_headers):
+    resp = client.get("/tasks?cursor=not-a-cursor", headers=user_token_headers)
+    assert resp.status_code == 400
+
+
+def test_search_tasks_substring_and_relevance(client, user_token_headers):
+    client.post("/tasks/", json={"title": "Quarterly zebrafish report"}, headers=user_token_headers)
+    client.post("/tasks/", json={"title": "Misc", "description": "mentions zebrafish once"}, headers=user_token_headers)
+    resp = client.get("/tasks?q=ebrafis&order=relevance", headers=user_token_headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 2
+    assert data["next_cursor"] is None
+    resp = client.get("/tasks?q=zebrafish&order=relevance&cursor=abc", headers=user_token_headers)
+    assert resp.status_code == 400
+
+
+def test_list_tasks_total_optional_and_invalidated(client, user_token_headers):
+    from app.services import task_cache
+
+    # without the response cache (off by default) or a conditional request, totals come from the count cache
+    resp = client.get("/tasks?q=CountMe&include_total=false", headers=user_token_headers)
+    assert resp.json()["total"] is None
+    client.post("/tasks/", json={"title": "CountMe 1"}, headers=user_token_headers)
+    assert client.get("/tasks?q=CountMe", headers=user_token_headers).json()["total"] == 1
+    # the second listing is served from the count cache; the next write invalidates it
+    hits = task_cache.counts.stats()["hits"]
+    assert client.get("/tasks?q=CountMe&offset=1", headers=user_token_headers).json()["total"] == 1
+    assert task_cache.counts.stats()["hits"] == hits + 1
+    client.post("/tasks/", json={"title": "CountMe 2"}, headers=user_token_headers)
+    data = client.get("/tasks?q=CountMe", headers=user_token_headers).json()
+    assert data["total"] == 2 and data["total_is_estimate"] is False
+
+
+def test_bulk_create_update_delete(client, user_token_headers):
+    resp = client.post("/tasks/bulk", json={"items": [{"title": "Bulk A"}, {"title": "Bulk B"}]}, headers=user_token_headers)
+    assert resp.status_code == 201
+    created = resp.json()
+    assert created["succeeded"] == 2
+    assert [(r["index"], r["task"]["title"]) for r in created["results"]] == [(0, "Bulk A"), (1, "Bulk B")]
+    ids = [r["id"] for r in created["results"]]
+
+    other = client.post("/tasks/bulk", json={"items": [{"title": "Bulk other"}]}, headers={}).status_code
+    assert other == 401
+
+    resp = client.patch(
+        "/tasks/bulk",
+        json={"items": [
+            {"id": ids[0], "status": "done"},
+            {"id": ids[1], "status": "bogus"},
+            {"id": 999999, "title": "missing"},
+        ]},
+        headers=user_token_headers,
+    )
+    results = resp.json()["results"]
+    assert [r["status"] for r in results] == ["updated", "invalid", "not_found"]
+    assert results[0]["task"]["status"] == "done"
+
+    resp = client.request("DELETE", "/tasks/bulk", json={"ids": ids + [999999]}, headers=user_token_headers)
+    assert [r["status"] for r in resp.json()["results"]] == ["deleted", "deleted", "not_found"]
+    assert client.get(f"/tasks/{ids[0]}", headers=user_token_headers).status_code == 404
+
+
+def test_bulk_update_rejects_nulls_per_item(client, user_token_headers):
+    created = client.post(
+        "/tasks/bulk", json={"items": [{"title": f"Bulk null {i}"} for i in range(3)]}, headers=user_token_headers
+    ).json()
+    a, b, c = (r["id"] for r in created["results"])
+    resp = client.patch(
+        "/tasks/bulk",
+        json={"items": [{"id": a, "title": None}, {"id": b, "status": None}, {"id": c, "description": None, "status": "done"}]},
+        headers=user_token_headers,
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [(r["status"], r.get("detail")) for r in results] == [
+        ("invalid", "title cannot be null"), ("invalid", "status cannot be null"), ("updated", None),
+    ]
+    assert results[2]["task"]["status"] == "done" and results[2]["task"]["description"] is None
+    assert client.put(f"/tasks/{a}", json={"title": None}, headers=user_token_headers).status_code == 400
+
+
+def test_bulk_update_survives_concurrent_delete(client, user_token_headers, monkeypatch):
+    from app.models.task import Task
+    from app.services import task_service
+
+    created = client.post(
+        "/tasks/bulk", json={"items": [{"title": "Bulk race kept"}, {"title": "Bulk race gone"}]}, headers=user_token_headers
+    ).json()
+    kept, gone = (r["id"] for r in created["results"])
+    check = task_service._bulk_access
+
+    def access_then_delete(db, ids, current_user):
+        result = check(db, ids, current_user)
+        db.query(Task).filter(Task.id == gone).delete()  # as if another request deleted it meanwhile
+        return result
+
+    monkeypatch.setattr(task_service, "_bulk_access", access_then_delete)
+    resp = client.patch(
+        "/tasks/bulk",
+        json={"items": [{"id": kept, "status": "done"}, {"id": gone, "title": "Bulk race renamed"}]},
+        headers=user_token_headers,
+    )
+    assert resp.status_code == 200
+    assert [r["status"] for r in resp.json()["results"]] == ["updated", "not_found"]
+    assert client.get(f"/tasks/{kept}", headers=user_token_headers).json()["status"] == "done"
+
+
+def test_bulk_ownership_checked_per_item(client, user_token_headers, admin_token_headers):
+    mine = client.post("/tasks/", json={"title": "Bulk admin owned"}, headers=admin_token_headers).json()["id"]
+    resp = client.request("DELETE", "/tasks/bulk", json={"ids": [mine]}, headers=user_token_headers)
+    assert resp.json()["results"][0]["status"] == "forbidden"
+    assert client.get(f"/tasks/{mine}", headers=admin_token_headers).status_code == 200
+
+
+def test_export_streams_ndjson_and_csv(client, user_token_headers, admin_token_headers):
+    client.post("/tasks/", json={"title": "ExportMe one", "description": "a,b"}, headers=user_token_headers)
+    client.post("/tasks/", json={"title": "ExportMe two"}, headers=user_token_headers)
+    client.post("/tasks/", json={"title": "ExportMe admin"}, headers=admin_token_headers)
+
+    resp = client.get("/tasks/export?q=ExportMe", headers=user_token_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert sorted(r["title"] for r in rows) == ["ExportMe one", "ExportMe two"]
+
+    resp = client.get("/tasks/export?q=ExportMe&format=csv&all=true", headers=admin_token_headers)
+    records = list(csv.DictReader(io.StringIO(resp.text)))
+    assert {r["title"] for r in records} == {"ExportMe one", "ExportMe two", "ExportMe admin"}
+    assert any(r["description"] == "a,b" for r in records)
+
+
+def test_import_csv_and_ndjson_with_row_errors(client, user_token_headers):
+    csv_body = "title,description,due_date\nImported A,first,2030-01-02\n,missing title,\nImported B,,\n"
+    resp = client.post("/tasks/import", files={"file": ("tasks.csv", csv_body, "text/csv")}, headers=user_token_headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["rows_read"], data["imported"], data["failed"]) == (3, 2, 1)
+    assert data["errors"][0]["line"] == 3
+
+    ndjson_body = '{"title": "Imported C"}\nnot json\n{"title": "Imported D", "due_date": "nope"}\n'
+    resp = client.post("/tasks/import", files={"file": ("tasks.ndjson", ndjson_body)}, headers=user_token_headers)
+    data = resp.json()
+    assert (data["imported"], data["failed"]) == (1, 2)
+
+    titles = {t["title"] for t in client.get("/tasks?q=Imported&limit=50", headers=user_token_headers).json()["items"]}
+    assert titles == {"Imported A", "Imported B", "Imported C"}
+
+
+def test_import_reports_invalid_utf8_per_row(client, user_token_headers):
+    for name, body in (
+        ("tasks.csv", "title\nUtf8Row caf\u00e9\n".encode() + b"Utf8Row bad \xff\nUtf8Row after\n"),
+        ("tasks.ndjson", '{"title": "Utf8Row json"}\n'.encode() + b'{"title": "Utf8Row \xc3"}\n{"title": "Utf8Row end"}\n'),
+    ):
+        resp = client.post("/tasks/import", files={"file": (name, body)}, headers=user_token_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert (data["rows_read"], data["imported"], data["failed"]) == (3, 2, 1)
+        assert data["errors"] == [{"line": 3 if name == "tasks.csv" else 2, "error": "Invalid UTF-8"}]
+    titles = {t["title"] for t in client.get("/tasks?q=Utf8Row&limit=50", headers=user_token_headers).json()["items"]}
+    assert titles == {"Utf8Row caf\u00e9", "Utf8Row after", "Utf8Row json", "Utf8Row end"}
+
+
+def test_import_keeps_empty_strings_apart_from_null(client, db_session, user_token_headers):
+    from app.models.task import Task
+    from app.services.import_service import _copy_field
+
+    body = '{"title": "  "}\n{"title": "Loaded empty desc", "description": ""}\n{"title": "Loaded no desc"}\n'
+    data = client.post("/tasks/import", files={"file": ("t.ndjson", body)}, headers=user_token_headers).json()
+    assert (data["imported"], data["failed"]) == (2, 1)
+    assert data["errors"][0] == {"line": 1, "error": "title: must not be blank"}
+    descriptions = dict(db_session.query(Task.title, Task.description).filter(Task.title.like("Loaded % desc")))
+    assert descriptions == {"Loaded empty desc": "", "Loaded no desc": None}
+    # What COPY receives on Postgres: quoted "" is an empty string, an unquoted empty field is NULL
+    assert ",".join(map(_copy_field, (1, "a \"b\"", "", None))) == '1,"a ""b""","",'
+
+
+def test_task_responses_match_schema_shape(client, db_session, user_token_headers):
+    from app.models.task import Task
+    from app.schemas.task import PaginatedTasks, TaskRead
+
+    created = client.post("/tasks/", json={"title": "Serialized shape", "due_date": "2030-01-02"}, headers=user_token_headers)
+    assert created.status_code == 201
+    assert created.headers["content-type"] == "application/json"
+    task = db_session.get(Task, created.json()["id"])
+    assert created.json() == TaskRead.model_validate(task).model_dump(mode="json")
+
+    page = client.get("/tasks/?q=Serialized shape", headers=user_token_headers).json()
+    assert list(page) == list(PaginatedTasks.model_fields)
+    assert page["items"] == [created.json()]
+    assert client.get(f"/tasks/{task.id}", headers=user_token_headers).json() == created.json()
+
+
+def test_conditional_get_task(client, user_token_headers, admin_token_headers):
+    task_id = client.post("/tasks/", json={"title": "ETag single"}, headers=user_token_headers).json()["id"]
+    first = client.get(f"/tasks/{task_id}", headers=user_token_headers)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    cached = client.get(f"/tasks/{task_id}", headers={**user_token_headers, "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["etag"] == etag and cached.content == b""
+    # Authorization still runs before the ETag is compared
+    client.post("/auth/register", json={"email": "etag-other@example.com", "password": "password123"})
+    token = client.post("/auth/login", data={"username": "etag-other@example.com", "password": "password123"}).json()["access_token"]
+    assert client.get(f"/tasks/{task_id}", headers={"Authorization": f"Bearer {token}", "If-None-Match": etag}).status_code == 403
+
+    client.put(f"/tasks/{task_id}", json={"status": "done"}, headers=user_token_headers)
+    changed = client.get(f"/tasks/{task_id}", headers={**user_token_headers, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["status"] == "done"
+    assert changed.headers["etag"] != etag
+
+
+def test_conditional_get_task_list(client, user_token_headers):
+    url = "/tasks/?q=ETag list&limit=5"
+    client.post("/tasks/", json={"title": "ETag list one"}, headers=user_token_headers)
+    etag = client.get(url, headers=user_token_headers).headers["etag"]
+    assert client.get(url, headers={**user_token_headers, "If-None-Match": f'W/"x", {etag}'}).status_code == 304
+    assert client.get(url + "&offset=1", headers={**user_token_headers, "If-None-Match": etag}).status_code == 200
+
+    # Inserts, updates (including bulk ones) and deletes each produce a new ETag
+    task_id = client.post("/tasks/", json={"title": "ETag list two"}, headers=user_token_headers).json()["id"]
+    for write in (
+        lambda: client.patch("/tasks/bulk", json={"items": [{"id": task_id, "status": "done"}]}, headers=user_token_headers),
+        lambda: client.delete(f"/tasks/{task_id}", headers=user_token_headers),
+    ):
+        resp = client.get(url, headers={**user_token_headers, "If-None-Match": etag})
+        assert resp.status_code == 200
+        etag = resp.headers["etag"]
+        write()
+    resp = client.get(url, headers={**user_token_headers, "If-None-Match": etag})
+    assert resp.status_code == 200 and resp.json()["total"] == 1
+
+
+def test_list_response_cache_and_invalidation(client, user_token_headers, admin_token_headers, response_cache):
+    url, admin_url = "/tasks/?q=RespCache", "/tasks/?q=RespCache&all=true"
+    client.post("/tasks/", json={"title": "RespCache one"}, headers=user_token_headers)
+    first = client.get(url, headers=user_token_headers)
+    hits = response_cache.stats()["hits"]
+    second = client.get(url, headers=user_token_headers)
+    assert second.content == first.content and second.headers["etag"] == first.headers["etag"]
+    assert response_cache.stats()["hits"] == hits + 1
+    assert client.get(url, headers={**user_token_headers, "If-None-Match": first.headers["etag"]}).status_code == 304
+    admin_first = client.get(admin_url, headers=admin_token_headers)
+    assert admin_first.json()["total"] == 1
+    # The ETag is derived from the cache key: spelling the query differently hits the same entry and tag
+    reordered = client.get("/tasks/?all=true&q=RespCache&limit=20", headers=admin_token_headers)
+    assert reordered.headers["etag"] == admin_first.headers["etag"]
+    assert response_cache.stats()["hits"] == hits + 2
+
+    # An owner's write invalidates their pages and every admin-wide page
+    client.post("/tasks/", json={"title": "RespCache two"}, headers=user_token_headers)
+    assert client.get(url, headers=user_token_headers).json()["total"] == 2
+    assert client.get(admin_url, headers=admin_token_headers).json()["total"] == 2
+
+    stats = client.get("/admin/diagnostics/caches", headers=admin_token_headers).json()["task_responses"]
+    assert stats["bytes"] > 0 and stats["maxbytes"] == response_cache.maxbytes
+
+
+def test_list_reflects_writes_from_other_workers(client, db_session, user_token_headers, response_cache):
+    from app.models.task import Task
+
+    url = "/tasks/?q=OtherWorker"
+    created = client.post("/tasks/", json={"title": "OtherWorker one"}, headers=user_token_headers).json()
+    first = client.get(url, headers=user_token_headers)
+    assert client.get(url, headers=user_token_headers).content == first.content  # served from the cache
+
+    # Written straight to the database: no in-process invalidation, as when another worker serves the write
+    task = db_session.get(Task, created["id"])
+    db_session.add(Task(owner_id=task.owner_id, title="OtherWorker two"))
+    db_session.commit()
+    resp = client.get(url, headers={**user_token_headers, "If-None-Match": first.headers["etag"]})
+    assert resp.status_code == 200 and resp.json()["total"] == 2
+    db_session.delete(task)
+    db_session.commit()
+    assert [t["title"] for t in client.get(url, headers=user_token_headers).json()["items"]] == ["OtherWorker two"]